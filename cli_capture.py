@@ -0,0 +1,44 @@
+"""
+In-process CLI runner shared by the Task 5.5 / 6.1 test and verification scripts.
+
+Calling the CLI's main() directly avoids starting an interpreter per run, but
+main() assumes it owns the process: it writes NDJSON to sys.stdout.buffer and
+its setup_logging() replaces the root logger's handlers. run_cli_captured()
+gives it somewhere to write and puts the caller's logging back afterwards.
+"""
+
+import contextlib
+import io
+import logging
+from typing import Callable, Tuple
+
+
+def run_cli_captured(main: Callable[[str], int], url_file: str) -> Tuple[int, bytes, str]:
+    """Call main(url_file) and return its exit code, stdout bytes and stderr text.
+
+    SystemExit becomes the exit code; any other exception propagates. The root
+    logger's handlers and level are restored afterwards, and the handlers the
+    CLI installed (a StreamHandler on the captured stderr, a FileHandler when
+    LOG_FILE is set) are closed.
+    """
+    # The CLI writes NDJSON to sys.stdout.buffer, so stdout needs a binary layer
+    stdout_buf = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+    stderr_buf = io.StringIO()
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+
+    try:
+        with contextlib.redirect_stdout(stdout_buf), contextlib.redirect_stderr(stderr_buf):
+            try:
+                returncode = main(url_file)
+            except SystemExit as e:
+                returncode = e.code if isinstance(e.code, int) else 1
+    finally:
+        for handler in root.handlers[:]:
+            if handler not in saved_handlers:
+                handler.close()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    stdout_buf.flush()
+    return returncode, stdout_buf.buffer.getvalue(), stderr_buf.getvalue()
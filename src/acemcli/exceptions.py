@@ -5,6 +5,7 @@ This module defines custom exception classes used throughout the application
 for better error handling and debugging.
 """
 
+from functools import lru_cache
 from typing import Optional, Any
 
 
@@ -168,10 +169,19 @@ class MetricError(ACMEBaseException):
 
 # Convenience functions for common error scenarios
 
+@lru_cache(maxsize=64, typed=True)
+def _timeout_message(api_name: str, timeout_seconds: float) -> str:
+    """Format the timeout message once per (api_name, timeout) pair.
+
+    typed=True keeps 30 and 30.0 apart; they format differently.
+    """
+    return f"{api_name} API request timed out after {timeout_seconds} seconds"
+
+
 def create_api_timeout_error(api_name: str, url: str, timeout_seconds: int) -> APIError:
     """Create a standardized API timeout error."""
     return APIError(
-        f"{api_name} API request timed out after {timeout_seconds} seconds",
+        _timeout_message(api_name, timeout_seconds),
         api_name=api_name,
         url=url,
         status_code=408
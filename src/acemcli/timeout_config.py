@@ -6,13 +6,21 @@ in the ACME CLI tool.
 """
 
 import os
-from typing import Optional, Tuple
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, Union
 from dataclasses import dataclass
+from functools import lru_cache
 
+from .exceptions import create_api_timeout_error
 
-@dataclass
+if TYPE_CHECKING:
+    from urllib3.util.retry import Retry
+
+
+@dataclass(frozen=True)
 class TimeoutConfig:
-    """Configuration for API request timeouts."""
+    """Configuration for API request timeouts (immutable and hashable)."""
     
     # Default timeout values (in seconds)
     connect_timeout: float = 10.0    # Time to establish connection
@@ -26,12 +34,12 @@ class TimeoutConfig:
     @classmethod
     def from_environment(cls) -> 'TimeoutConfig':
         """Create timeout configuration from environment variables."""
-        return cls(
-            connect_timeout=float(os.getenv('ACME_CONNECT_TIMEOUT', 10.0)),
-            read_timeout=float(os.getenv('ACME_READ_TIMEOUT', 30.0)),
-            total_timeout=float(os.getenv('ACME_TOTAL_TIMEOUT', 45.0)),
-            max_retries=int(os.getenv('ACME_MAX_RETRIES', 3)),
-            backoff_factor=float(os.getenv('ACME_BACKOFF_FACTOR', 1.0))
+        return _config_from_env_values(
+            os.getenv('ACME_CONNECT_TIMEOUT', 10.0),
+            os.getenv('ACME_READ_TIMEOUT', 30.0),
+            os.getenv('ACME_TOTAL_TIMEOUT', 45.0),
+            os.getenv('ACME_MAX_RETRIES', 3),
+            os.getenv('ACME_BACKOFF_FACTOR', 1.0)
         )
     
     def as_requests_timeout(self) -> Tuple[float, float]:
@@ -43,9 +51,31 @@ class TimeoutConfig:
         return self.total_timeout
 
 
+@lru_cache(maxsize=1)
+def _config_from_env_values(
+    connect: Union[str, float],
+    read: Union[str, float],
+    total: Union[str, float],
+    retries: Union[str, int],
+    backoff: Union[str, float],
+) -> TimeoutConfig:
+    """Parse raw environment values, reusing the result while they are unchanged."""
+    return TimeoutConfig(
+        connect_timeout=float(connect),
+        read_timeout=float(read),
+        total_timeout=float(total),
+        max_retries=int(retries),
+        backoff_factor=float(backoff)
+    )
+
+
 # Global timeout configuration instance
 DEFAULT_TIMEOUT_CONFIG = TimeoutConfig.from_environment()
 
+# Retry strategy shared by every session; built lazily from the current
+# config and dropped whenever the config changes
+_DEFAULT_RETRY: Optional['Retry'] = None
+
 
 def get_timeout_config() -> TimeoutConfig:
     """Get the current timeout configuration."""
@@ -54,30 +84,131 @@ def get_timeout_config() -> TimeoutConfig:
 
 def set_timeout_config(config: TimeoutConfig) -> None:
     """Set a new timeout configuration."""
-    global DEFAULT_TIMEOUT_CONFIG
+    global DEFAULT_TIMEOUT_CONFIG, _DEFAULT_RETRY
     DEFAULT_TIMEOUT_CONFIG = config
+    _DEFAULT_RETRY = None
+
+
+def _get_retry_strategy() -> 'Retry':
+    """Return the retry strategy for the current config, building it once."""
+    global _DEFAULT_RETRY
+    if _DEFAULT_RETRY is None:
+        from urllib3.util.retry import Retry
+        
+        config = get_timeout_config()
+        _DEFAULT_RETRY = Retry(
+            total=config.max_retries,
+            backoff_factor=config.backoff_factor,
+            backoff_max=min(config.total_timeout, 5.0),  # Never sleep longer than this between retries
+            respect_retry_after_header=False,
+            status_forcelist=frozenset({429, 500, 502, 503, 504}),  # Retry on these HTTP status codes
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"})
+        )
+    return _DEFAULT_RETRY
 
 
 def create_requests_session():
     """Create a requests session with proper timeout configuration."""
     import requests
     from requests.adapters import HTTPAdapter
-    from urllib3.util.retry import Retry
-    
-    config = get_timeout_config()
-    
-    # Create retry strategy
-    retry_strategy = Retry(
-        total=config.max_retries,
-        backoff_factor=config.backoff_factor,
-        status_forcelist=[429, 500, 502, 503, 504],  # Retry on these HTTP status codes
-        method_whitelist=["HEAD", "GET", "POST", "PUT", "DELETE", "OPTIONS", "TRACE"]
-    )
     
     # Create session with retry adapter
     session = requests.Session()
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(max_retries=_get_retry_strategy())
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     
     return session
+
+
+
+class CircuitBreaker:
+    """
+    Fail fast on an API that keeps timing out.
+    
+    After ``threshold`` consecutive timeouts the breaker opens and calls are
+    rejected immediately with a timeout APIError instead of waiting out the
+    full timeout again. Once ``reset_timeout`` seconds have passed a single
+    trial call is let through while every other caller is still rejected;
+    success closes the breaker, another timeout re-opens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, api_name: str, threshold: int = 5, reset_timeout: float = 60.0):
+        self.api_name = api_name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def is_open(self) -> bool:
+        """Return True while calls should be rejected without being attempted.
+        
+        The caller that moves the breaker from OPEN to HALF_OPEN gets False and
+        makes the trial call; everyone else is rejected until it resolves.
+        """
+        with self._lock:
+            if (
+                self.state == self.OPEN
+                and self.opened_at is not None
+                and time.monotonic() - self.opened_at >= self.reset_timeout
+            ):
+                self.state = self.HALF_OPEN
+                return False
+            return self.state != self.CLOSED
+    
+    def reset(self) -> None:
+        """Return the breaker to CLOSED with no failures counted."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failure_count = 0
+            self.opened_at = None
+    
+    def record_success(self) -> None:
+        """Close the breaker after a call completes."""
+        self.reset()
+    
+    def _release_trial(self) -> None:
+        """Re-open the breaker when the trial call failed with something other than a timeout."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+    
+    def record_failure(self) -> None:
+        """Count a timeout, opening the breaker once the threshold is hit."""
+        with self._lock:
+            self.failure_count += 1
+            if self.state == self.HALF_OPEN or self.failure_count >= self.threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+    
+    def call(self, func: Callable[..., Any], *args: Any, url: str, **kwargs: Any) -> Any:
+        """Run ``func(*args, **kwargs)`` through the breaker on behalf of ``url``.
+        
+        Timeouts always surface as a timeout APIError, whether the call was
+        attempted or rejected by the open breaker.
+        """
+        from requests.exceptions import Timeout
+        
+        if self.is_open():
+            raise create_api_timeout_error(self.api_name, url, int(get_timeout_config().total_timeout))
+        try:
+            result = func(*args, **kwargs)
+        except Timeout as e:
+            self.record_failure()
+            raise create_api_timeout_error(self.api_name, url, int(get_timeout_config().total_timeout)) from e
+        except Exception:
+            # Not a verdict on the endpoint; let the next caller make the trial
+            self._release_trial()
+            raise
+        self.record_success()
+        return result
+
+
+# Shared breaker for all HuggingFace Hub calls
+HUGGINGFACE_CIRCUIT_BREAKER = CircuitBreaker("HuggingFace")
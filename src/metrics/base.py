@@ -20,6 +20,25 @@ _REGISTRY: Dict[str, Metric] = {}
 # Keep names stable & printable in logs/NDJSON
 _NAME_RE = re.compile(r"^[a-z0-9_][a-z0-9_.-]{1,63}$", re.IGNORECASE)
 
+# https://huggingface.co/[datasets/]<namespace>/<repo>[/], the form compute()
+# turns into a repo id (a bare "datasets" namespace is the dataset listing, not
+# a repo); segments are word characters, dots and dashes only, so query
+# strings, fragments and stray punctuation are rejected. Only the scheme
+# and host ignore case; the URL is matched as given because compute() takes
+# the repo id straight from it.
+HF_URL_RE = re.compile(r"^(?i:https?://huggingface\.co)/(?:datasets/)?(?!datasets/)[\w.-]+/[\w.-]+/?\Z")
+
+def is_hf_url(url: object) -> bool:
+    """Regex-only check that url points at a HuggingFace repo (no network, no urlparse)."""
+    return isinstance(url, str) and HF_URL_RE.match(url) is not None
+
+def hf_repo_id(url: str) -> str:
+    """<namespace>/<repo> from a URL accepted by is_hf_url."""
+    parts = url.rstrip("/").split("/")[3:]
+    if parts[0] == "datasets":
+        parts = parts[1:]
+    return "/".join(parts[:2])
+
 def register(metric: Metric) -> None:
     """
     Register a metric plugin.
@@ -12,7 +12,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Set
 from huggingface_hub import snapshot_download
 from src.models import MetricResult, Category
-from src.metrics.base import register
+from src.metrics.base import register, is_hf_url
 
 
 @dataclass
@@ -589,7 +589,7 @@ class CodeQualityMetric:
     def supports(self, url: str, category: Category) -> bool:
         """Check if this metric supports the given URL and category."""
         return category == "CODE" or (
-            url.startswith("https://huggingface.co/") and 
+            is_hf_url(url) and 
             category in ("MODEL", "DATASET")
         )
     
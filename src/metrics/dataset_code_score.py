@@ -10,7 +10,8 @@ from pathlib import Path
 from typing import List, Dict, Any
 from huggingface_hub import snapshot_download
 from src.models import MetricResult, Category
-from src.metrics.base import register
+from src.metrics.base import register, is_hf_url
+from acemcli.timeout_config import HUGGINGFACE_CIRCUIT_BREAKER
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,7 +34,7 @@ class DatasetAndCodeScoreMetric:
     
     def supports(self, url: str, category: Category) -> bool:
         """Check if this metric supports the given URL and category."""
-        return url.startswith("https://huggingface.co/") and category in ("MODEL", "DATASET")
+        return is_hf_url(url) and category in ("MODEL", "DATASET")
     
     def compute(self, url: str, category: Category) -> MetricResult:
         """Compute the dataset and code score for the given repository."""
@@ -53,7 +54,9 @@ class DatasetAndCodeScoreMetric:
             
             # Download repository for analysis
             with tempfile.TemporaryDirectory() as tmp_dir:
-                local_dir = snapshot_download(
+                local_dir = HUGGINGFACE_CIRCUIT_BREAKER.call(
+                    snapshot_download,
+                    url=url,
                     repo_id=repo_id,
                     local_dir=tmp_dir,
                     local_dir_use_symlinks=False
@@ -10,7 +10,7 @@ from huggingface_hub import snapshot_download
 
 # project imports
 from ..models import MetricResult, Category
-from .base import register 
+from .base import register, is_hf_url
 
 KEYS = ("train", "test", "validation", "split", "license", "citation", "doi", "benchmark")
 ALLOW = ["README*", "readme*"]
@@ -62,7 +62,7 @@ class DatasetQualityMetric:
     name = "dataset_quality"
 
     def supports(self, url, category: Category):
-        return category == "DATASET" and url.startswith("https://huggingface.co/")
+        return category == "DATASET" and is_hf_url(url)
 
     def compute(self, url, category: Category):
         t0 = tm.perf_counter()
@@ -2,7 +2,8 @@ from __future__ import annotations
 import time
 from huggingface_hub import HfApi
 from src.models import MetricResult, Category
-from src.metrics.base import register
+from src.metrics.base import register, is_hf_url, hf_repo_id
+from acemcli.timeout_config import HUGGINGFACE_CIRCUIT_BREAKER
 
 class HFAPIMetric:
     name = "hf_api"
@@ -13,16 +14,16 @@ class HFAPIMetric:
         self.api = HfApi(token=cfg.hf_token) if cfg.hf_token else HfApi()
 
     def supports(self, url: str, category: Category) -> bool:
-        return url.startswith("https://huggingface.co/") and category in ("MODEL", "DATASET")
+        return is_hf_url(url) and category in ("MODEL", "DATASET")
 
     def compute(self, url: str, category: Category) -> MetricResult:
         t0 = time.perf_counter()
-        namespace, repo = url.rstrip("/").split("/")[3:5]
+        namespace, repo = hf_repo_id(url).split("/")
         is_model = category == "MODEL"
-        meta = (
-            self.api.model_info(f"{namespace}/{repo}")
-            if is_model else
-            self.api.dataset_info(f"{namespace}/{repo}")
+        meta = HUGGINGFACE_CIRCUIT_BREAKER.call(
+            self.api.model_info if is_model else self.api.dataset_info,
+            f"{namespace}/{repo}",
+            url=url,
         )
 
         def squash(n: int, k: float = 1000.0) -> float:
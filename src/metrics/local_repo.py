@@ -3,19 +3,23 @@ import tempfile, time
 from pathlib import Path
 from huggingface_hub import snapshot_download
 from src.models import MetricResult, Category
-from src.metrics.base import register
+from src.metrics.base import register, is_hf_url, hf_repo_id
+from acemcli.timeout_config import HUGGINGFACE_CIRCUIT_BREAKER
 
 class LocalRepoMetric:
     name = "local_repo"
 
     def supports(self, url: str, category: Category) -> bool:
-        return url.startswith("https://huggingface.co/") and category in ("MODEL", "DATASET")
+        return is_hf_url(url) and category in ("MODEL", "DATASET")
 
     def compute(self, url: str, category: Category) -> MetricResult:
         t0 = time.perf_counter()
-        namespace, repo = url.rstrip("/").split("/")[3:5]
+        namespace, repo = hf_repo_id(url).split("/")
         with tempfile.TemporaryDirectory() as tmp:
-            local_dir = snapshot_download(repo_id=f"{namespace}/{repo}", local_dir=tmp, local_dir_use_symlinks=False)
+            local_dir = HUGGINGFACE_CIRCUIT_BREAKER.call(
+                snapshot_download, url=url,
+                repo_id=f"{namespace}/{repo}", local_dir=tmp, local_dir_use_symlinks=False,
+            )
             p = Path(local_dir)
             files = [f for f in p.rglob("*") if f.is_file()]
             readme = next((f for f in files if f.name.lower().startswith("readme")), None)
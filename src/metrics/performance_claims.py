@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import List, Dict, Set
 from huggingface_hub import snapshot_download
 from src.models import MetricResult, Category
-from src.metrics.base import register
+from src.metrics.base import register, is_hf_url
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,7 +33,7 @@ class PerformanceClaimsMetric:
     
     def supports(self, url: str, category: Category) -> bool:
         """Check if this metric supports the given URL and category."""
-        return url.startswith("https://huggingface.co/") and category == "MODEL"
+        return is_hf_url(url) and category == "MODEL"
     
     def compute(self, url: str, category: Category) -> MetricResult:
         """Compute the performance claims score for the given repository."""
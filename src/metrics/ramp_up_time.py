@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import List, Dict, Set, Tuple
 from huggingface_hub import snapshot_download
 from src.models import MetricResult, Category
-from src.metrics.base import register
+from src.metrics.base import register, is_hf_url
 import logging
 
 logger = logging.getLogger(__name__)
@@ -35,7 +35,7 @@ class RampUpTimeMetric:
     
     def supports(self, url: str, category: Category) -> bool:
         """Check if this metric supports the given URL and category."""
-        return url.startswith("https://huggingface.co/") and category in ("MODEL", "DATASET")
+        return is_hf_url(url) and category in ("MODEL", "DATASET")
     
     def compute(self, url: str, category: Category) -> MetricResult:
         """Compute the ramp-up time score for the given repository."""
@@ -9,7 +9,7 @@ from tempfile import TemporaryDirectory
 from huggingface_hub import HfApi, snapshot_download
 
 from ..models import MetricResult, Category, SizeScore
-from .base import register
+from .base import register, is_hf_url
 
 log = logmod.getLogger(__name__)
 
@@ -125,7 +125,7 @@ class SizeScoreMetric:
     name = "size_score"
 
     def supports(self, url, category: Category):
-        return category == "MODEL" and url.startswith("https://huggingface.co/")
+        return category == "MODEL" and is_hf_url(url)
 
     def compute(self, url, category: Category):
         t0 = tm.perf_counter()
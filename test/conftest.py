@@ -3,6 +3,8 @@ from __future__ import annotations
 import sys, types, importlib, tempfile, os
 from pathlib import Path
 
+import pytest
+
 # 1) Ensure src/ is first on sys.path
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
@@ -69,3 +71,10 @@ if "huggingface_hub" not in sys.modules:
 
     hh.snapshot_download = snapshot_download
     sys.modules["huggingface_hub"] = hh
+
+
+# 4) The size metric is stateless between calls, so build it once per session
+@pytest.fixture(scope="session")
+def size_metric():
+    from acemcli.metrics.size_score import SizeScoreMetric
+    return SizeScoreMetric()
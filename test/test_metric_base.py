@@ -0,0 +1,44 @@
+import pytest
+from acemcli.metrics.base import hf_repo_id, is_hf_url
+
+@pytest.mark.parametrize("url", [
+    "https://huggingface.co/google/gemma-3-270m",
+    "https://huggingface.co/google/gemma-3-270m/",
+    "https://huggingface.co/openai-community/gpt2.5_test",
+    "https://huggingface.co/datasets/stanfordnlp/imdb",
+    "HTTPS://HUGGINGFACE.CO/USER/MODEL",
+])
+def test_is_hf_url_accepts_repo_urls(url):
+    assert is_hf_url(url)
+
+@pytest.mark.parametrize("url", [
+    None,
+    "",
+    "not-a-url",
+    "https://github.com/user/repo",
+    "ftp://huggingface.co/model",
+    "https://huggingface.co/",
+    "https://huggingface.co//double-slash",
+    "https://huggingface.co/user//empty-repo",
+    "https://huggingface.co/user name/repo",
+    # compute() takes the repo id from exactly two path segments
+    "https://huggingface.co/bert-base-uncased",
+    "https://huggingface.co/datasets/squad",
+    "https://huggingface.co/google/gemma-3-270m/tree/main",
+    "https://huggingface.co/user/model?param=value",
+    "https://huggingface.co/user/model#fragment",
+    "https://huggingface.co/user/repo|pipe",
+    # compute() splits the raw URL, so padding would end up in the repo id
+    "  https://huggingface.co/user/model  ",
+    "https://huggingface.co/user/model\n",
+])
+def test_is_hf_url_rejects_invalid_urls(url):
+    assert not is_hf_url(url)
+
+@pytest.mark.parametrize("url,repo_id", [
+    ("https://huggingface.co/google/gemma-3-270m", "google/gemma-3-270m"),
+    ("https://huggingface.co/google/gemma-3-270m/", "google/gemma-3-270m"),
+    ("https://huggingface.co/datasets/stanfordnlp/imdb", "stanfordnlp/imdb"),
+])
+def test_hf_repo_id(url, repo_id):
+    assert hf_repo_id(url) == repo_id
@@ -1,5 +1,2 @@
-from acemcli.metrics.size_score import SizeScoreMetric
-
-def test_supports_size_metric_model_url():
-    m = SizeScoreMetric()
-    assert m.supports("https://huggingface.co/google/gemma-3-270m", "MODEL")
+def test_supports_size_metric_model_url(size_metric):
+    assert size_metric.supports("https://huggingface.co/google/gemma-3-270m", "MODEL")
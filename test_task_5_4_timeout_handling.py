@@ -5,14 +5,20 @@ This test file verifies that all API requests have proper timeout handling
 and that timeouts are handled gracefully with appropriate error messages.
 """
 
+import dataclasses
 import pytest
 import time
 import unittest.mock as mock
 from unittest.mock import patch, MagicMock
 import requests
 from requests.exceptions import Timeout, ConnectionError, HTTPError
+from huggingface_hub import HfApi
+from pytest_httpserver import HTTPServer
+from werkzeug.wrappers import Response
 
 from acemcli.timeout_config import (
+    CircuitBreaker,
+    HUGGINGFACE_CIRCUIT_BREAKER,
     TimeoutConfig, 
     get_timeout_config, 
     set_timeout_config, 
@@ -23,6 +29,36 @@ from acemcli.metrics.hf_api import HFAPIMetric
 from acemcli.metrics.local_repo import LocalRepoMetric
 from acemcli.metrics.dataset_code_score import DatasetAndCodeScoreMetric
 
+_TEST_MODEL_URL = "https://huggingface.co/test/model"
+
+# Shared exception instances used as mock side effects
+_TIMEOUT_EXC = Timeout("Request timed out")
+_CONN_EXC = ConnectionError("Connection failed")
+
+
+@pytest.fixture(scope="class", autouse=True)
+def _test_config():
+    """Install short test timeouts once per test class."""
+    previous = get_timeout_config()
+    cfg = TimeoutConfig(connect_timeout=1.0, read_timeout=2.0, total_timeout=3.0, max_retries=1)
+    set_timeout_config(cfg)
+    yield cfg
+    set_timeout_config(previous)
+
+
+@pytest.fixture(autouse=True)
+def _reset_circuit_breaker():
+    """Keep timeouts recorded by one test from opening the shared breaker for the next."""
+    HUGGINGFACE_CIRCUIT_BREAKER.reset()
+    yield
+    HUGGINGFACE_CIRCUIT_BREAKER.reset()
+
+
+@pytest.fixture(scope="module")
+def hf_api_mock():
+    """Autospec of HfApi built once per module; tests reset it before use."""
+    return mock.create_autospec(HfApi, spec_set=True)
+
 
 class TestTimeoutConfiguration:
     """Test the centralized timeout configuration."""
@@ -37,6 +73,14 @@ class TestTimeoutConfiguration:
         assert config.max_retries == 3
         assert config.backoff_factor == 1.0
     
+    def test_timeout_config_is_frozen(self):
+        """Test that timeout configuration is immutable and hashable."""
+        config = TimeoutConfig()
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.total_timeout = 1.0
+        assert hash(config) == hash(TimeoutConfig())
+    
     def test_timeout_config_from_environment(self):
         """Test timeout configuration from environment variables."""
         with patch.dict('os.environ', {
@@ -76,198 +120,237 @@ class TestTimeoutConfiguration:
         # Check that adapters are properly mounted
         assert 'http://' in session.adapters
         assert 'https://' in session.adapters
+    
+    def test_retry_backoff_is_bounded(self):
+        """Test that retries cannot sleep for long between attempts."""
+        original_config = get_timeout_config()
+        try:
+            set_timeout_config(TimeoutConfig(total_timeout=3.0, backoff_factor=10.0))
+            retry = create_requests_session().get_adapter('https://').max_retries
+            
+            assert retry.backoff_max == 3.0
+            assert retry.respect_retry_after_header is False
+            assert retry.allowed_methods == frozenset({"GET", "HEAD", "OPTIONS"})
+        finally:
+            set_timeout_config(original_config)
+    
+    def test_sessions_share_retry_strategy(self):
+        """Test that sessions reuse one Retry until the config changes."""
+        original_config = get_timeout_config()
+        try:
+            first = create_requests_session().get_adapter('https://').max_retries
+            second = create_requests_session().get_adapter('https://').max_retries
+            assert first is second
+            
+            set_timeout_config(TimeoutConfig(max_retries=7))
+            rebuilt = create_requests_session().get_adapter('https://').max_retries
+            assert rebuilt is not first
+            assert rebuilt.total == 7
+        finally:
+            set_timeout_config(original_config)
 
 
 class TestHFAPITimeoutHandling:
     """Test timeout handling in HuggingFace API metric."""
     
-    def setup_method(self):
-        """Set up test environment."""
-        # Use shorter timeouts for testing
-        self.test_config = TimeoutConfig(
-            connect_timeout=1.0,
-            read_timeout=2.0,
-            total_timeout=3.0,
-            max_retries=1
-        )
-        set_timeout_config(self.test_config)
-        
-        self.metric = HFAPIMetric()
-        self.test_url = \"https://huggingface.co/test/model\"
+    @pytest.fixture(autouse=True)
+    def _hf_api(self, hf_api_mock):
+        """Patch HfApi with the shared autospec for every test in the class."""
+        hf_api_mock.reset_mock()
+        hf_api_mock.return_value.model_info.side_effect = None
+        with mock.patch('acemcli.metrics.hf_api.HfApi', new=hf_api_mock):
+            yield hf_api_mock
     
-    def test_timeout_initialization(self):
-        \"\"\"Test that HFAPIMetric properly initializes with timeout config.\"\"\"
-        assert self.metric.timeout_config == self.test_config
-        assert hasattr(self.metric, 'session')
+    def test_timeout_initialization(self, _test_config):
+        """Test that HFAPIMetric properly initializes with timeout config."""
+        metric = HFAPIMetric()
+        assert metric.timeout_config == _test_config
+        assert hasattr(metric, 'session')
     
-    @patch('acemcli.metrics.hf_api.HfApi')
-    def test_api_timeout_handling(self, mock_hf_api):
-        \"\"\"Test that API timeouts are properly caught and handled.\"\"\"
+    def test_api_timeout_handling(self, _hf_api, _test_config):
+        """Test that API timeouts are properly caught and handled."""
         # Mock the API to raise a timeout
-        mock_api_instance = MagicMock()
-        mock_api_instance.model_info.side_effect = Timeout(\"Request timed out\")
-        mock_hf_api.return_value = mock_api_instance
-        
+        _hf_api.return_value.model_info.side_effect = _TIMEOUT_EXC
         metric = HFAPIMetric()
         
-        with pytest.raises(APIError) as exc_info:
-            metric.compute(self.test_url, \"MODEL\")
+        with pytest.raises(APIError, match=r"(?i)timed out") as exc_info:
+            metric.compute(_TEST_MODEL_URL, "MODEL")
         
         error = exc_info.value
-        assert \"timed out\" in error.message.lower()
-        assert error.api_name == \"HuggingFace\"
+        assert error.api_name == "HuggingFace"
         assert error.status_code == 408
-        assert str(self.test_config.total_timeout).rstrip('.0') in error.message
-    
-    @patch('acemcli.metrics.hf_api.HfApi')
-    def test_connection_error_handling(self, mock_hf_api):
-        \"\"\"Test that connection errors are properly handled.\"\"\"
-        mock_api_instance = MagicMock()
-        mock_api_instance.model_info.side_effect = ConnectionError(\"Connection failed\")
-        mock_hf_api.return_value = mock_api_instance
-        
+        assert str(_test_config.total_timeout).rstrip('.0') in error.message
+    
+    def test_connection_error_handling(self, _hf_api):
+        """Test that connection errors are properly handled."""
+        _hf_api.return_value.model_info.side_effect = _CONN_EXC
         metric = HFAPIMetric()
         
-        with pytest.raises(APIError) as exc_info:
-            metric.compute(self.test_url, \"MODEL\")
+        with pytest.raises(APIError, match=r"(?i)connection error") as exc_info:
+            metric.compute(_TEST_MODEL_URL, "MODEL")
         
         error = exc_info.value
-        assert \"connection error\" in error.message.lower()
-        assert error.api_name == \"HuggingFace\"
+        assert error.api_name == "HuggingFace"
     
-    @patch('acemcli.metrics.hf_api.HfApi')
-    def test_http_error_handling(self, mock_hf_api):
-        \"\"\"Test that HTTP errors are properly handled.\"\"\"
-        mock_api_instance = MagicMock()
+    def test_http_error_handling(self, _hf_api):
+        """Test that HTTP errors are properly handled."""
         mock_response = MagicMock()
         mock_response.status_code = 404
-        http_error = HTTPError(\"Not found\")
+        http_error = HTTPError("Not found")
         http_error.response = mock_response
-        mock_api_instance.model_info.side_effect = http_error
-        mock_hf_api.return_value = mock_api_instance
-        
+        _hf_api.return_value.model_info.side_effect = http_error
         metric = HFAPIMetric()
         
         with pytest.raises(APIError) as exc_info:
-            metric.compute(self.test_url, \"MODEL\")
+            metric.compute(_TEST_MODEL_URL, "MODEL")
         
         error = exc_info.value
         assert error.status_code == 404
-        assert error.api_name == \"HuggingFace\"
+        assert error.api_name == "HuggingFace"
 
 
 class TestLocalRepoTimeoutHandling:
-    \"\"\"Test timeout handling in local repository analysis.\"\"\"
+    """Test timeout handling in local repository analysis."""
     
-    def setup_method(self):
-        \"\"\"Set up test environment.\"\"\"
-        self.test_config = TimeoutConfig(
-            connect_timeout=1.0,
-            read_timeout=2.0,
-            total_timeout=3.0,
-            max_retries=1
-        )
-        set_timeout_config(self.test_config)
-        
-        self.metric = LocalRepoMetric()
-        self.test_url = \"https://huggingface.co/test/model\"
-    
-    def test_timeout_initialization(self):
-        \"\"\"Test that LocalRepoMetric properly initializes with timeout config.\"\"\"
-        assert self.metric.timeout_config == self.test_config
-        assert hasattr(self.metric, 'session')
+    def test_timeout_initialization(self, _test_config):
+        """Test that LocalRepoMetric properly initializes with timeout config."""
+        metric = LocalRepoMetric()
+        assert metric.timeout_config == _test_config
+        assert hasattr(metric, 'session')
     
     @patch('acemcli.metrics.local_repo.snapshot_download')
-    def test_download_timeout_handling(self, mock_snapshot_download):
-        \"\"\"Test that download timeouts are properly caught and handled.\"\"\"
-        mock_snapshot_download.side_effect = Timeout(\"Download timed out\")
+    def test_download_with_timeout_parameter(self, mock_snapshot_download, _test_config):
+        """Test that download is called with proper timeout parameter."""
+        mock_snapshot_download.return_value = "/tmp/test"
         
-        with pytest.raises(APIError) as exc_info:
-            self.metric._download_repo_safely(\"test/model\", \"/tmp\")
-        
-        error = exc_info.value
-        assert \"timed out\" in error.message.lower()
-        assert error.api_name == \"HuggingFace\"
-        assert error.status_code == 408
-    
-    @patch('acemcli.metrics.local_repo.snapshot_download')
-    def test_download_with_timeout_parameter(self, mock_snapshot_download):
-        \"\"\"Test that download is called with proper timeout parameter.\"\"\"
-        mock_snapshot_download.return_value = \"/tmp/test\"
-        
-        self.metric._download_repo_safely(\"test/model\", \"/tmp\")
+        LocalRepoMetric()._download_repo_safely("test/model", "/tmp")
         
         # Verify that snapshot_download was called with timeout
         mock_snapshot_download.assert_called_once()
         call_kwargs = mock_snapshot_download.call_args[1]
         assert 'timeout' in call_kwargs
-        assert call_kwargs['timeout'] == self.test_config.total_timeout
+        assert call_kwargs['timeout'] == _test_config.total_timeout
 
 
 class TestDatasetCodeScoreTimeoutHandling:
-    \"\"\"Test timeout handling in dataset code score metric.\"\"\"
+    """Test timeout handling in dataset code score metric."""
     
-    def setup_method(self):
-        \"\"\"Set up test environment.\"\"\"
-        self.test_config = TimeoutConfig(
-            connect_timeout=1.0,
-            read_timeout=2.0,
-            total_timeout=3.0,
-            max_retries=1
-        )
-        set_timeout_config(self.test_config)
-        
-        self.metric = DatasetAndCodeScoreMetric()
-        self.test_url = \"https://huggingface.co/test/dataset\"
-    
-    def test_timeout_initialization(self):
-        \"\"\"Test that DatasetAndCodeScoreMetric properly initializes with timeout config.\"\"\"
-        assert self.metric.timeout_config == self.test_config
-        assert hasattr(self.metric, 'session')
-    
-    @patch('acemcli.metrics.dataset_code_score.snapshot_download')
-    def test_download_timeout_handling(self, mock_snapshot_download):
-        \"\"\"Test that download timeouts are properly caught and handled.\"\"\"
-        mock_snapshot_download.side_effect = Timeout(\"Download timed out\")
+    def test_timeout_initialization(self, _test_config):
+        """Test that DatasetAndCodeScoreMetric properly initializes with timeout config."""
+        metric = DatasetAndCodeScoreMetric()
+        assert metric.timeout_config == _test_config
+        assert hasattr(metric, 'session')
+
+
+class TestDownloadTimeoutHandling:
+    """Test timeout handling shared by the repository-downloading metrics."""
+    
+    @pytest.mark.parametrize("patch_target, metric_cls", [
+        ("acemcli.metrics.local_repo.snapshot_download", LocalRepoMetric),
+        ("acemcli.metrics.dataset_code_score.snapshot_download", DatasetAndCodeScoreMetric),
+    ])
+    def test_download_timeout_handling(self, patch_target, metric_cls):
+        """Test that download timeouts are properly caught and handled."""
+        metric = metric_cls()
         
-        with pytest.raises(APIError) as exc_info:
-            self.metric._download_repo_safely(\"test/dataset\", \"/tmp\")
+        with mock.patch(patch_target) as mock_snapshot_download:
+            mock_snapshot_download.side_effect = Timeout("Download timed out")
+            
+            with pytest.raises(APIError, match=r"(?i)timed out") as exc_info:
+                metric._download_repo_safely("test/model", "/tmp")
         
         error = exc_info.value
-        assert \"timed out\" in error.message.lower()
-        assert error.api_name == \"HuggingFace\"
+        assert error.api_name == "HuggingFace"
         assert error.status_code == 408
 
 
+class TestCircuitBreaker:
+    """Test that repeated timeouts make later calls fail fast."""
+    
+    def test_opens_after_threshold_failures(self):
+        """Test that an open breaker raises without invoking the downloader."""
+        breaker = CircuitBreaker("HuggingFace", threshold=3)
+        downloader = MagicMock(side_effect=_TIMEOUT_EXC)
+        
+        for _ in range(3):
+            with pytest.raises(APIError, match=r"(?i)timed out"):
+                breaker.call(downloader, url=_TEST_MODEL_URL, repo_id="test/model")
+        downloader.reset_mock()
+        
+        with pytest.raises(APIError, match=r"(?i)timed out") as exc_info:
+            breaker.call(downloader, url=_TEST_MODEL_URL, repo_id="test/model")
+        
+        downloader.assert_not_called()
+        assert exc_info.value.api_name == "HuggingFace"
+        assert exc_info.value.status_code == 408
+    
+    def test_success_resets_failure_count(self):
+        """Test that a successful call clears earlier timeouts."""
+        breaker = CircuitBreaker("HuggingFace", threshold=2)
+        downloader = MagicMock(side_effect=[_TIMEOUT_EXC, "/tmp/test", _TIMEOUT_EXC])
+        
+        with pytest.raises(APIError, match=r"(?i)timed out"):
+            breaker.call(downloader, url=_TEST_MODEL_URL)
+        assert breaker.call(downloader, url=_TEST_MODEL_URL) == "/tmp/test"
+        with pytest.raises(APIError, match=r"(?i)timed out"):
+            breaker.call(downloader, url=_TEST_MODEL_URL)
+        
+        assert not breaker.is_open()
+    
+    def test_half_open_trial_after_reset_timeout(self):
+        """Test that a trial call is allowed once the reset timeout elapses."""
+        breaker = CircuitBreaker("HuggingFace", threshold=1, reset_timeout=0.0)
+        downloader = MagicMock(side_effect=[_TIMEOUT_EXC, "/tmp/test"])
+        
+        with pytest.raises(APIError, match=r"(?i)timed out"):
+            breaker.call(downloader, url=_TEST_MODEL_URL)
+        
+        assert breaker.call(downloader, url=_TEST_MODEL_URL) == "/tmp/test"
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_half_open_lets_only_one_trial_through(self):
+        """Test that callers arriving during the trial call are still rejected."""
+        breaker = CircuitBreaker("HuggingFace", threshold=1, reset_timeout=0.0)
+        with pytest.raises(APIError, match=r"(?i)timed out"):
+            breaker.call(MagicMock(side_effect=_TIMEOUT_EXC), url=_TEST_MODEL_URL)
+        
+        assert not breaker.is_open()  # this caller makes the trial
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.is_open()
+        
+        breaker.record_success()
+        assert not breaker.is_open()
+
+
 class TestTimeoutErrorCreation:
-    \"\"\"Test creation of timeout-related errors.\"\"\"
+    """Test creation of timeout-related errors."""
     
     def test_create_api_timeout_error(self):
-        \"\"\"Test creation of API timeout errors.\"\"\"
-        error = create_api_timeout_error(\"TestAPI\", \"https://example.com\", 30)
+        """Test creation of API timeout errors."""
+        error = create_api_timeout_error("TestAPI", "https://example.com", 30)
         
         assert isinstance(error, APIError)
-        assert \"TestAPI\" in error.message
-        assert \"30 seconds\" in error.message
-        assert error.api_name == \"TestAPI\"
-        assert error.url == \"https://example.com\"
+        assert "TestAPI" in error.message
+        assert "30 seconds" in error.message
+        assert error.api_name == "TestAPI"
+        assert error.url == "https://example.com"
         assert error.status_code == 408
     
     def test_timeout_error_details(self):
-        \"\"\"Test that timeout errors contain proper details.\"\"\"
-        error = create_api_timeout_error(\"GitHub\", \"https://github.com/test\", 45)
+        """Test that timeout errors contain proper details."""
+        error = create_api_timeout_error("GitHub", "https://github.com/test", 45)
         
-        assert error.details['api_name'] == \"GitHub\"
-        assert error.details['url'] == \"https://github.com/test\"
+        assert error.details['api_name'] == "GitHub"
+        assert error.details['url'] == "https://github.com/test"
         assert error.details['status_code'] == 408
 
 
 @pytest.mark.integration
 class TestEndToEndTimeoutHandling:
-    \"\"\"Integration tests for timeout handling across the system.\"\"\"
+    """Integration tests for timeout handling across the system."""
     
     def setup_method(self):
-        \"\"\"Set up test environment with very short timeouts.\"\"\"
+        """Set up test environment with very short timeouts."""
         self.original_config = get_timeout_config()
         
         # Set very short timeouts for integration testing
@@ -280,57 +363,37 @@ class TestEndToEndTimeoutHandling:
         set_timeout_config(self.test_config)
     
     def teardown_method(self):
-        \"\"\"Restore original configuration.\"\"\"
+        """Restore original configuration."""
         set_timeout_config(self.original_config)
     
-    def test_requests_session_timeout_behavior(self):
-        \"\"\"Test that requests session properly applies timeouts.\"\"\"
+    def test_requests_session_timeout_behavior(self, httpserver: HTTPServer):
+        """Test that requests session properly applies timeouts."""
+        httpserver.expect_request("/delay").respond_with_handler(
+            lambda request: (time.sleep(0.05), Response())[1]
+        )
         session = create_requests_session()
         
         # This should timeout very quickly with our short timeout
         with pytest.raises((Timeout, ConnectionError, requests.exceptions.RequestException)):
-            session.get(\"https://httpbin.org/delay/1\", timeout=self.test_config.as_requests_timeout())
+            session.get(httpserver.url_for("/delay"), timeout=self.test_config.as_requests_timeout())
 
 
-def test_task_5_4_completion():
-    \"\"\"Test that Task 5.4 requirements are met.\"\"\"
-    # Verify timeout configuration exists
-    config = get_timeout_config()
-    assert isinstance(config, TimeoutConfig)
-    
-    # Verify all metrics have timeout configuration
-    hf_metric = HFAPIMetric()
-    assert hasattr(hf_metric, 'timeout_config')
-    assert hasattr(hf_metric, 'session')
-    
-    local_metric = LocalRepoMetric()
-    assert hasattr(local_metric, 'timeout_config')
-    assert hasattr(local_metric, 'session')
-    
-    dataset_metric = DatasetAndCodeScoreMetric()
-    assert hasattr(dataset_metric, 'timeout_config')
-    assert hasattr(dataset_metric, 'session')
-    
-    # Verify error handling functions exist
-    error = create_api_timeout_error(\"Test\", \"https://test.com\", 30)
-    assert isinstance(error, APIError)
-    assert error.status_code == 408
-    
-    print(\"✅ Task 5.4: API timeout handling implementation COMPLETE!\")
-    print(\"   - Centralized timeout configuration ✓\")
-    print(\"   - Enhanced HuggingFace API timeout handling ✓\")
-    print(\"   - Enhanced local repository timeout handling ✓\")
-    print(\"   - Enhanced dataset code score timeout handling ✓\")
-    print(\"   - Comprehensive timeout error handling ✓\")
-    print(\"   - Configurable timeout values via environment variables ✓\")
+@pytest.mark.parametrize("cls", [HFAPIMetric, LocalRepoMetric, DatasetAndCodeScoreMetric])
+def test_task_5_4_completion(cls):
+    """Test that every network-bound metric carries timeout configuration."""
+    metric = cls()
+    assert hasattr(metric, 'timeout_config')
+    assert hasattr(metric, 'session')
 
 
-if __name__ == \"__main__\":
+if __name__ == "__main__":
     # Run the completion test
-    test_task_5_4_completion()
+    for metric_cls in (HFAPIMetric, LocalRepoMetric, DatasetAndCodeScoreMetric):
+        test_task_5_4_completion(metric_cls)
+    print("✅ Task 5.4: API timeout handling implementation COMPLETE!")
     
     # Run a simple timeout test
-    print(\"\\n🧪 Running basic timeout functionality test...\")
+    print("\n🧪 Running basic timeout functionality test...")
     
     # Test configuration
     config = TimeoutConfig(connect_timeout=5.0, read_timeout=10.0, total_timeout=15.0)
@@ -341,12 +404,12 @@ if __name__ == \"__main__\":
     local_metric = LocalRepoMetric()
     dataset_metric = DatasetAndCodeScoreMetric()
     
-    print(f\"   HF API metric timeout config: {hf_metric.timeout_config.total_timeout}s ✓\")
-    print(f\"   Local repo metric timeout config: {local_metric.timeout_config.total_timeout}s ✓\")
-    print(f\"   Dataset metric timeout config: {dataset_metric.timeout_config.total_timeout}s ✓\")
+    print(f"   HF API metric timeout config: {hf_metric.timeout_config.total_timeout}s ✓")
+    print(f"   Local repo metric timeout config: {local_metric.timeout_config.total_timeout}s ✓")
+    print(f"   Dataset metric timeout config: {dataset_metric.timeout_config.total_timeout}s ✓")
     
     # Test session creation
     session = create_requests_session()
-    print(f\"   Created requests session with retry strategy ✓\")
+    print(f"   Created requests session with retry strategy ✓")
     
-    print(\"\\n🎯 Task 5.4 API timeout handling implementation is ready for testing!\")
+    print("\n🎯 Task 5.4 API timeout handling implementation is ready for testing!")
@@ -5,67 +5,225 @@ This module tests various invalid URL scenarios to ensure the CLI and all metric
 handle them gracefully with proper error messages and exit codes.
 """
 
+import contextlib
+import functools
 import subprocess
 import tempfile
 import os
 import sys
+import threading
 import time
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 import pytest
 
+from cli_capture import run_cli_captured
+
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
 # Add the src directory to Python path
 sys.path.insert(0, '/Users/blas/Documents/Obsidian Vault/School/F25/ECE 461/Project Repo/ECE30861_HW1/src')
 
+from acemcli.cli import main as cli_main
 from acemcli.exceptions import APIError, ValidationError, MetricError
-from acemcli.models import Category
 from acemcli.metrics.hf_api import HFAPIMetric
 from acemcli.metrics.local_repo import LocalRepoMetric
 from acemcli.metrics.dataset_code_score import DatasetAndCodeScoreMetric
 from acemcli.metrics.performance_claims import PerformanceClaimsMetric
 
 
+def _http_cache():
+    """Cache Hugging Face lookups for an hour, only while the suite runs.
+    
+    The non-existent repositories give the same 404 every run, so negative
+    results are kept too. requests_cache patches requests.Session for the
+    whole process, so it is uninstalled again on exit rather than left on
+    for whatever runs next.
+    """
+    if requests_cache is None:
+        return contextlib.nullcontext()
+    return requests_cache.enabled(
+        os.path.join(tempfile.gettempdir(), 'acemcli_test_cache'),
+        expire_after=3600,
+        allowable_codes=(200, 401, 403, 404),
+    )
+
+# URL files are tiny; keep them in RAM-backed storage where the OS has it
+_URL_FILE_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+CLI_INVALID_URL_CASES = [
+    {
+        "name": "Empty URLs",
+        "urls": ["", "   ", "\t"],
+        "expected_behavior": "Should skip empty URLs gracefully"
+    },
+    {
+        "name": "Malformed URLs",
+        "urls": ["not-a-url", "htp://broken-protocol", "https://", "://missing-protocol"],
+        "expected_behavior": "Should show validation errors"
+    },
+    {
+        "name": "Invalid Protocols",
+        "urls": ["ftp://huggingface.co/model", "file:///local/path", "mailto:test@example.com"],
+        "expected_behavior": "Should reject non-HTTP(S) protocols"
+    },
+    {
+        "name": "Non-HuggingFace URLs",
+        "urls": ["https://github.com/user/repo", "https://google.com", "https://pypi.org/project/requests"],
+        "expected_behavior": "Should reject non-HuggingFace URLs"
+    },
+    {
+        "name": "Malformed HuggingFace URLs",
+        "urls": [
+            "https://huggingface.co/",
+            "https://huggingface.co/incomplete",
+            "https://huggingface.co//double-slash",
+            "https://huggingface.co/user//empty-repo"
+        ],
+        "expected_behavior": "Should reject incomplete HuggingFace URLs"
+    },
+    {
+        "name": "URLs with Invalid Characters",
+        "urls": [
+            "https://huggingface.co/user name/repo",  # Space in URL
+            "https://huggingface.co/user/repo\nnewline",  # Newline in URL
+            "https://huggingface.co/user/repo|pipe",  # Invalid character
+        ],
+        "expected_behavior": "Should handle URLs with invalid characters"
+    },
+    {
+        "name": "Very Long URLs",
+        "urls": [
+            f"https://huggingface.co/{'a' * 1000}/{'b' * 1000}",  # Very long URL
+        ],
+        "expected_behavior": "Should handle extremely long URLs"
+    },
+    {
+        "name": "Non-existent Repositories",
+        "urls": [
+            "https://huggingface.co/definitely-does-not-exist/invalid-repo-12345",
+            "https://huggingface.co/user/nonexistent-model-xyz",
+        ],
+        "expected_behavior": "Should show API errors for non-existent repos"
+    }
+]
+
+# Invalid URL cases the CLI may skip and still exit 0; every other case must
+# make it fail with exit code 1
+CLI_MAY_EXIT_ZERO = frozenset({"Empty URLs"})
+
+INVALID_METRIC_URLS = [
+    (None, "None URL"),
+    ("", "Empty string"),
+    ("not-a-url", "Invalid format"),
+    ("https://github.com/user/repo", "Non-HuggingFace URL"),
+    ("https://huggingface.co/", "Incomplete HuggingFace URL"),
+    ("https://huggingface.co/nonexistent/model-12345", "Non-existent repository"),
+]
+
+EDGE_CASES = [
+    {
+        "name": "Unicode URLs",
+        "urls": ["https://huggingface.co/üser/mödel", "https://huggingface.co/用户/模型"],
+        "description": "URLs with Unicode characters"
+    },
+    {
+        "name": "URLs with Query Parameters",
+        "urls": [
+            "https://huggingface.co/user/model?param=value",
+            "https://huggingface.co/user/model#fragment"
+        ],
+        "description": "URLs with query parameters and fragments"
+    },
+    {
+        "name": "Case Variations",
+        "urls": [
+            "HTTPS://HUGGINGFACE.CO/USER/MODEL",
+            "https://HUGGINGFACE.co/user/MODEL"
+        ],
+        "description": "URLs with different case variations"
+    },
+    {
+        "name": "Trailing/Leading Whitespace",
+        "urls": [
+            "  https://huggingface.co/user/model  ",
+            "\thttps://huggingface.co/user/model\n"
+        ],
+        "description": "URLs with whitespace padding"
+    }
+]
+
+
+def _remove_files(paths: List[str]) -> None:
+    """Best-effort removal of temporary URL files."""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+METRIC_CLASSES = [
+    ("HuggingFace API", HFAPIMetric),
+    ("Local Repository", LocalRepoMetric),
+    ("Dataset Code Score", DatasetAndCodeScoreMetric),
+    ("Performance Claims", PerformanceClaimsMetric),
+]
+
+
+@functools.lru_cache(maxsize=None)
+def _get_metrics() -> Tuple[Tuple[str, Any], ...]:
+    """Build the metrics under test once and share them across the suite."""
+    return tuple((name, metric_cls()) for name, metric_cls in METRIC_CLASSES)
+
+
 class InvalidURLTestSuite:
     """Comprehensive test suite for invalid URL error scenarios."""
     
     def __init__(self):
         self.project_root = Path('/Users/blas/Documents/Obsidian Vault/School/F25/ECE 461/Project Repo/ECE30861_HW1')
-        self.run_script = self.project_root / 'run'
+        self._project_root_str = str(self.project_root)
         self.test_results = []
+        # URL files are removed together when the suite goes away
+        self._tmp_files: List[str] = []
+        weakref.finalize(self, _remove_files, self._tmp_files)
         
     def create_url_file(self, urls: List[str]) -> str:
         """Create a temporary file with URLs for testing."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            for url in urls:
-                f.write(url + '\n')
-            return f.name
+        # Each line is encoded once; an empty list still yields an empty file
+        data = b''.join(url.encode('utf-8') + b'\n' for url in urls)
+        with tempfile.NamedTemporaryFile(mode='wb', prefix='acemcli-', suffix='.txt', dir=_URL_FILE_DIR, delete=False) as f:
+            f.write(data)
+        self._tmp_files.append(f.name)
+        return f.name
     
-    def run_cli_with_urls(self, urls: List[str]) -> Tuple[int, str, str]:
-        """Run the CLI with a list of URLs and return exit code, stdout, stderr."""
-        url_file = self.create_url_file(urls)
-        
+    def run_cli_in_process(self, url_file: str) -> Tuple[int, str, str]:
+        """Call the CLI entry point directly and return exit code, stdout, stderr."""
         try:
-            # Run the CLI command
-            result = subprocess.run(
-                [str(self.run_script), url_file],
-                cwd=str(self.project_root),
-                capture_output=True,
-                text=True,
-                timeout=60  # 60 second timeout
-            )
-            
-            return result.returncode, result.stdout, result.stderr
-            
-        except subprocess.TimeoutExpired:
-            return -1, "", "Process timed out"
+            exit_code, stdout, stderr = run_cli_captured(cli_main, url_file)
         except Exception as e:
             return -1, "", f"Process error: {str(e)}"
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(url_file)
-            except:
-                pass
+        return exit_code, stdout.decode('utf-8'), stderr
+    
+    def run_cli_with_urls(self, urls: List[str]) -> Tuple[int, str, str]:
+        """Run the CLI with a list of URLs and return exit code, stdout, stderr."""
+        return self.run_cli_in_process(self.create_url_file(urls))
+    
+    def run_cli_groups(self, url_groups: List[List[str]]) -> List[Tuple[int, str, str]]:
+        """Run each URL group through its own CLI invocation.
+        
+        Every verdict needs the group's own exit code, so groups are never
+        merged into one run, and none is skipped on the assumption that the
+        CLI would filter all of its URLs out.
+        """
+        return [self.run_cli_with_urls(urls) for urls in url_groups]
 
     def test_cli_invalid_url_scenarios(self) -> Dict[str, Any]:
         """Test CLI with various invalid URL scenarios."""
@@ -73,70 +231,16 @@ class InvalidURLTestSuite:
         print("🧪 Testing CLI with Invalid URL Scenarios")
         print("=" * 60)
         
-        test_cases = [
-            {
-                "name": "Empty URLs",
-                "urls": ["", "   ", "\t"],
-                "expected_behavior": "Should skip empty URLs gracefully"
-            },
-            {
-                "name": "Malformed URLs",
-                "urls": ["not-a-url", "htp://broken-protocol", "https://", "://missing-protocol"],
-                "expected_behavior": "Should show validation errors"
-            },
-            {
-                "name": "Invalid Protocols",
-                "urls": ["ftp://huggingface.co/model", "file:///local/path", "mailto:test@example.com"],
-                "expected_behavior": "Should reject non-HTTP(S) protocols"
-            },
-            {
-                "name": "Non-HuggingFace URLs",
-                "urls": ["https://github.com/user/repo", "https://google.com", "https://pypi.org/project/requests"],
-                "expected_behavior": "Should reject non-HuggingFace URLs"
-            },
-            {
-                "name": "Malformed HuggingFace URLs",
-                "urls": [
-                    "https://huggingface.co/",
-                    "https://huggingface.co/incomplete",
-                    "https://huggingface.co//double-slash",
-                    "https://huggingface.co/user//empty-repo"
-                ],
-                "expected_behavior": "Should reject incomplete HuggingFace URLs"
-            },
-            {
-                "name": "URLs with Invalid Characters",
-                "urls": [
-                    "https://huggingface.co/user name/repo",  # Space in URL
-                    "https://huggingface.co/user/repo\nnewline",  # Newline in URL
-                    "https://huggingface.co/user/repo|pipe",  # Invalid character
-                ],
-                "expected_behavior": "Should handle URLs with invalid characters"
-            },
-            {
-                "name": "Very Long URLs",
-                "urls": [
-                    f"https://huggingface.co/{'a' * 1000}/{'b' * 1000}",  # Very long URL
-                ],
-                "expected_behavior": "Should handle extremely long URLs"
-            },
-            {
-                "name": "Non-existent Repositories",
-                "urls": [
-                    "https://huggingface.co/definitely-does-not-exist/invalid-repo-12345",
-                    "https://huggingface.co/user/nonexistent-model-xyz",
-                ],
-                "expected_behavior": "Should show API errors for non-existent repos"
-            }
-        ]
+        test_cases = CLI_INVALID_URL_CASES
         
         results = {"passed": 0, "failed": 0, "details": []}
+        buf: List[str] = []
         
-        for test_case in test_cases:
-            print(f"\n🔍 Testing: {test_case['name']}")
-            print(f"   Expected: {test_case['expected_behavior']}")
-            
-            exit_code, stdout, stderr = self.run_cli_with_urls(test_case['urls'])
+        group_results = self.run_cli_groups([test_case['urls'] for test_case in test_cases])
+        
+        for test_case, (exit_code, stdout, stderr) in zip(test_cases, group_results):
+            buf.append(f"\n🔍 Testing: {test_case['name']}\n")
+            buf.append(f"   Expected: {test_case['expected_behavior']}\n")
             
             # Analyze results
             test_passed = False
@@ -144,7 +248,7 @@ class InvalidURLTestSuite:
             
             if exit_code == 0:
                 # CLI should not succeed with invalid URLs
-                if test_case['name'] in ["Empty URLs"]:
+                if test_case['name'] in CLI_MAY_EXIT_ZERO:
                     # Empty URLs might be skipped gracefully
                     test_passed = True
                     error_message = "Empty URLs handled gracefully"
@@ -158,14 +262,14 @@ class InvalidURLTestSuite:
                 error_message = f"CLI failed with unexpected exit code {exit_code}"
             
             if test_passed:
-                print(f"   ✅ {error_message}")
+                buf.append(f"   ✅ {error_message}\n")
                 results["passed"] += 1
             else:
-                print(f"   ❌ {error_message}")
+                buf.append(f"   ❌ {error_message}\n")
                 if stdout:
-                    print(f"      STDOUT: {stdout[:200]}...")
+                    buf.append(f"      STDOUT: {stdout[:200]}...\n")
                 if stderr:
-                    print(f"      STDERR: {stderr[:200]}...")
+                    buf.append(f"      STDERR: {stderr[:200]}...\n")
                 results["failed"] += 1
             
             results["details"].append({
@@ -175,69 +279,91 @@ class InvalidURLTestSuite:
                 "message": error_message
             })
         
+        self._emit(buf)
+        results["total"] = results["passed"] + results["failed"]
         return results
 
+    @staticmethod
+    def _emit(buf: List[str]) -> None:
+        """Write a method's buffered report lines in one call."""
+        sys.stdout.write(''.join(buf))
+        sys.stdout.flush()
+    
+    @staticmethod
+    def _classify_exception(e: Exception) -> str:
+        """Return "expected" for the project's error types, else "unexpected"."""
+        if isinstance(e, (ValidationError, APIError, MetricError)):
+            return "expected"
+        return "unexpected"
+    
+    def _probe(self, metric, url) -> Tuple[str, str, str, float]:
+        """Compute one (metric, url) pair and classify the outcome.
+        
+        Returns (status, exception type name, message, elapsed milliseconds) where
+        status is "succeeded", "expected" or "unexpected".
+        """
+        start_ns = time.perf_counter_ns()
+        try:
+            metric.compute(url, "MODEL")
+        except Exception as e:
+            return self._classify_exception(e), type(e).__name__, str(e), (time.perf_counter_ns() - start_ns) / 1e6
+        return "succeeded", "", "", (time.perf_counter_ns() - start_ns) / 1e6
+
     def test_metric_invalid_url_handling(self) -> Dict[str, Any]:
         """Test individual metrics with invalid URLs."""
         
         print("\n🔧 Testing Individual Metrics with Invalid URLs")
         print("=" * 60)
         
-        # Initialize metrics to test
-        metrics = [
-            ("HuggingFace API", HFAPIMetric()),
-            ("Local Repository", LocalRepoMetric()),
-            ("Dataset Code Score", DatasetAndCodeScoreMetric()),
-            ("Performance Claims", PerformanceClaimsMetric()),
-        ]
-        
-        invalid_urls = [
-            (None, "None URL"),
-            ("", "Empty string"),
-            ("not-a-url", "Invalid format"),
-            ("https://github.com/user/repo", "Non-HuggingFace URL"),
-            ("https://huggingface.co/", "Incomplete HuggingFace URL"),
-            ("https://huggingface.co/nonexistent/model-12345", "Non-existent repository"),
-        ]
+        metrics = _get_metrics()
+        
+        invalid_urls = INVALID_METRIC_URLS
+        
+        # supports() is cheap and runs inline; only the pairs it accepts are
+        # computed, concurrently, since those calls are network-bound
+        outcomes: Dict[Tuple[str, str], Tuple[str, str, str, float]] = {}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = {}
+            for metric_name, metric in metrics:
+                for invalid_url, description in invalid_urls:
+                    try:
+                        if metric.supports(invalid_url, "MODEL") is False:
+                            outcomes[(metric_name, description)] = ("rejected", "", "", 0.0)
+                            continue
+                    except Exception as e:
+                        outcomes[(metric_name, description)] = (
+                            self._classify_exception(e), type(e).__name__, str(e), 0.0
+                        )
+                        continue
+                    futures[executor.submit(self._probe, metric, invalid_url)] = (metric_name, description)
+            
+            for future, key in futures.items():
+                outcomes[key] = future.result()
         
         results = {"passed": 0, "failed": 0, "details": []}
+        buf: List[str] = []
         
-        for metric_name, metric in metrics:
-            print(f"\n🔍 Testing {metric_name} Metric:")
+        # Report in a fixed order regardless of completion order
+        for metric_name, _ in metrics:
+            buf.append(f"\n🔍 Testing {metric_name} Metric:\n")
             
             for invalid_url, description in invalid_urls:
-                try:
-                    # Test supports method first
-                    supports_result = metric.supports(invalid_url, Category.MODEL)
-                    
-                    if supports_result is False:
-                        print(f"   ✅ {description}: Correctly rejected by supports()")
-                        results["passed"] += 1
-                        continue
-                    
-                    # If supports() returns True, test compute method
-                    start_time = time.time()
-                    result = metric.compute(invalid_url, Category.MODEL)
-                    elapsed_time = time.time() - start_time
-                    
-                    # If we get here, the metric didn't raise an exception
-                    print(f"   ⚠️  {description}: Unexpectedly succeeded (took {elapsed_time:.2f}s)")
-                    results["failed"] += 1
-                    
-                except ValidationError as e:
-                    print(f"   ✅ {description}: Properly raised ValidationError - {str(e)[:100]}...")
-                    results["passed"] += 1
-                    
-                except APIError as e:
-                    print(f"   ✅ {description}: Properly raised APIError - {str(e)[:100]}...")
+                status, exc_name, message, elapsed_ms = outcomes[(metric_name, description)]
+                
+                if status == "rejected":
+                    buf.append(f"   ✅ {description}: Correctly rejected by supports()\n")
                     results["passed"] += 1
-                    
-                except MetricError as e:
-                    print(f"   ✅ {description}: Properly raised MetricError - {str(e)[:100]}...")
+                    continue
+                
+                if status == "succeeded":
+                    # The metric didn't raise an exception
+                    buf.append(f"   ⚠️  {description}: Unexpectedly succeeded (took {elapsed_ms:.2f}ms)\n")
+                    results["failed"] += 1
+                elif status == "expected":
+                    buf.append(f"   ✅ {description}: Properly raised {exc_name} - {message[:100]}...\n")
                     results["passed"] += 1
-                    
-                except Exception as e:
-                    print(f"   ⚠️  {description}: Raised unexpected {type(e).__name__} - {str(e)[:100]}...")
+                else:
+                    buf.append(f"   ⚠️  {description}: Raised unexpected {exc_name} - {message[:100]}...\n")
                     results["failed"] += 1
                 
                 results["details"].append({
@@ -246,6 +372,8 @@ class InvalidURLTestSuite:
                     "url": str(invalid_url)[:50] + "..." if len(str(invalid_url)) > 50 else str(invalid_url)
                 })
         
+        self._emit(buf)
+        results["total"] = results["passed"] + results["failed"]
         return results
 
     def test_edge_cases(self) -> Dict[str, Any]:
@@ -254,54 +382,25 @@ class InvalidURLTestSuite:
         print("\n🎯 Testing Edge Cases and Boundary Conditions")
         print("=" * 60)
         
-        edge_cases = [
-            {
-                "name": "Unicode URLs",
-                "urls": ["https://huggingface.co/üser/mödel", "https://huggingface.co/用户/模型"],
-                "description": "URLs with Unicode characters"
-            },
-            {
-                "name": "URLs with Query Parameters",
-                "urls": [
-                    "https://huggingface.co/user/model?param=value",
-                    "https://huggingface.co/user/model#fragment"
-                ],
-                "description": "URLs with query parameters and fragments"
-            },
-            {
-                "name": "Case Variations",
-                "urls": [
-                    "HTTPS://HUGGINGFACE.CO/USER/MODEL",
-                    "https://HUGGINGFACE.co/user/MODEL"
-                ],
-                "description": "URLs with different case variations"
-            },
-            {
-                "name": "Trailing/Leading Whitespace",
-                "urls": [
-                    "  https://huggingface.co/user/model  ",
-                    "\thttps://huggingface.co/user/model\n"
-                ],
-                "description": "URLs with whitespace padding"
-            }
-        ]
+        edge_cases = EDGE_CASES
         
         results = {"passed": 0, "failed": 0, "details": []}
+        buf: List[str] = []
         
-        for case in edge_cases:
-            print(f"\n🔍 Testing: {case['name']}")
-            print(f"   Description: {case['description']}")
-            
-            exit_code, stdout, stderr = self.run_cli_with_urls(case['urls'])
+        group_results = self.run_cli_groups([case['urls'] for case in edge_cases])
+        
+        for case, (exit_code, stdout, stderr) in zip(edge_cases, group_results):
+            buf.append(f"\n🔍 Testing: {case['name']}\n")
+            buf.append(f"   Description: {case['description']}\n")
             
             # For edge cases, we mainly want to ensure the CLI doesn't crash
             if exit_code in [0, 1]:  # Either success or controlled failure
-                print(f"   ✅ CLI handled edge case gracefully (exit code {exit_code})")
+                buf.append(f"   ✅ CLI handled edge case gracefully (exit code {exit_code})\n")
                 results["passed"] += 1
             else:
-                print(f"   ❌ CLI crashed or had unexpected behavior (exit code {exit_code})")
+                buf.append(f"   ❌ CLI crashed or had unexpected behavior (exit code {exit_code})\n")
                 if stderr:
-                    print(f"      STDERR: {stderr[:200]}...")
+                    buf.append(f"      STDERR: {stderr[:200]}...\n")
                 results["failed"] += 1
             
             results["details"].append({
@@ -310,6 +409,8 @@ class InvalidURLTestSuite:
                 "handled_gracefully": exit_code in [0, 1]
             })
         
+        self._emit(buf)
+        results["total"] = results["passed"] + results["failed"]
         return results
 
     def test_file_handling_errors(self) -> Dict[str, Any]:
@@ -319,70 +420,86 @@ class InvalidURLTestSuite:
         print("=" * 60)
         
         results = {"passed": 0, "failed": 0, "details": []}
+        buf: List[str] = []
         
         # Test 1: Non-existent file
-        print("🔍 Testing non-existent URL file...")
-        result = subprocess.run(
-            [str(self.run_script), "/nonexistent/file.txt"],
-            cwd=str(self.project_root),
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode != 0:
-            print("   ✅ CLI properly failed for non-existent file")
+        buf.append("🔍 Testing non-existent URL file...\n")
+        # Output stays as bytes; only the previewed prefix is ever decoded.
+        # The CLI module is run directly, with this process's import path, so
+        # no shell wrapper is forked and the same acemcli is imported.
+        # At most 4 KiB of stdout is read; the read runs on a thread so a child
+        # still running after 60s can be killed and reported as a failure.
+        # stderr goes to a temp file, where the CLI's error message is checked.
+        deadline = time.monotonic() + 60
+        with tempfile.TemporaryFile() as stderr_file, subprocess.Popen(
+            [sys.executable, '-m', 'acemcli.cli', "/nonexistent/file.txt"],
+            cwd=self._project_root_str,
+            env={**os.environ, 'PYTHONPATH': os.pathsep.join(sys.path)},
+            stdout=subprocess.PIPE,
+            stderr=stderr_file
+        ) as proc:
+            head: List[bytes] = []
+            reader = threading.Thread(target=lambda: head.append(proc.stdout.read(4096)), daemon=True)
+            reader.start()
+            reader.join(timeout=60)
+            if reader.is_alive():
+                proc.kill()
+                reader.join()
+                returncode = None
+            else:
+                # Closing our end stops a child that keeps writing past the cap
+                proc.stdout.close()
+                try:
+                    returncode = proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait()
+                    returncode = None
+            stderr_file.seek(0)
+            stderr_head = stderr_file.read(4096).decode('utf-8', errors='replace')
+        stdout_head = head[0] if head else b''
+        
+        if returncode is None:
+            buf.append("   ❌ CLI timed out after 60 seconds on a non-existent file\n")
+            results["failed"] += 1
+        elif returncode != 0 and "URL_FILE" in stderr_head:
+            buf.append("   ✅ CLI properly failed for non-existent file\n")
             results["passed"] += 1
         else:
-            print("   ❌ CLI should fail for non-existent file")
+            buf.append("   ❌ CLI should fail with an error message for non-existent file\n")
+            buf.append(f"      Exit code: {returncode}\n")
+            if stdout_head:
+                buf.append(f"      STDOUT: {stdout_head[:200].decode('utf-8', errors='replace')}...\n")
+            if stderr_head:
+                buf.append(f"      STDERR: {stderr_head[:200]}...\n")
             results["failed"] += 1
         
         # Test 2: Empty file
-        print("\n🔍 Testing empty URL file...")
-        empty_file = self.create_url_file([])
+        buf.append("\n🔍 Testing empty URL file...\n")
+        exit_code, _, _ = self.run_cli_with_urls([])
         
-        try:
-            result = subprocess.run(
-                [str(self.run_script), empty_file],
-                cwd=str(self.project_root),
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            # Empty file should be handled gracefully
-            if result.returncode == 0:
-                print("   ✅ CLI handled empty file gracefully")
-                results["passed"] += 1
-            else:
-                print(f"   ⚠️  CLI failed with empty file (exit code {result.returncode})")
-                results["failed"] += 1
-                
-        finally:
-            os.unlink(empty_file)
+        # Empty file should be handled gracefully
+        if exit_code == 0:
+            buf.append("   ✅ CLI handled empty file gracefully\n")
+            results["passed"] += 1
+        else:
+            buf.append(f"   ⚠️  CLI failed with empty file (exit code {exit_code})\n")
+            results["failed"] += 1
         
         # Test 3: File with only whitespace
-        print("\n🔍 Testing file with only whitespace...")
-        whitespace_file = self.create_url_file(["   ", "\t", "\n", ""])
+        buf.append("\n🔍 Testing file with only whitespace...\n")
+        exit_code, _, stderr = self.run_cli_with_urls(["   ", "\t", "\n", ""])
         
-        try:
-            result = subprocess.run(
-                [str(self.run_script), whitespace_file],
-                cwd=str(self.project_root),
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            # Should handle whitespace gracefully
-            print(f"   ✅ CLI handled whitespace-only file (exit code {result.returncode})")
+        # Should handle whitespace gracefully
+        if exit_code != -1:
+            buf.append(f"   ✅ CLI handled whitespace-only file (exit code {exit_code})\n")
             results["passed"] += 1
-            
-        except Exception as e:
-            print(f"   ❌ CLI failed with whitespace file: {e}")
+        else:
+            buf.append(f"   ❌ CLI failed with whitespace file: {stderr}\n")
             results["failed"] += 1
-        finally:
-            os.unlink(whitespace_file)
         
+        self._emit(buf)
+        results["total"] = results["passed"] + results["failed"]
         return results
 
     def run_comprehensive_test(self) -> bool:
@@ -405,24 +522,25 @@ class InvalidURLTestSuite:
         all_results.extend([cli_results, metric_results, edge_results, file_results])
         
         # Calculate overall results
-        total_passed = sum(r["passed"] for r in all_results)
-        total_failed = sum(r["failed"] for r in all_results)
-        total_tests = total_passed + total_failed
+        totals = sum((Counter(passed=r["passed"], total=r["total"]) for r in all_results), Counter())
+        total_passed = totals["passed"]
+        total_tests = totals["total"]
+        pass_rate = total_passed / total_tests if total_tests else 0.0
         
         print("\n" + "=" * 70)
         print("📊 TASK 5.5 TEST RESULTS SUMMARY")
         print("=" * 70)
         
-        print(f"CLI Invalid URL Tests:     {cli_results['passed']}/{cli_results['passed'] + cli_results['failed']} passed")
-        print(f"Metric Error Handling:     {metric_results['passed']}/{metric_results['passed'] + metric_results['failed']} passed")
-        print(f"Edge Case Handling:        {edge_results['passed']}/{edge_results['passed'] + edge_results['failed']} passed")
-        print(f"File Handling Errors:      {file_results['passed']}/{file_results['passed'] + file_results['failed']} passed")
+        print(f"CLI Invalid URL Tests:     {cli_results['passed']}/{cli_results['total']} passed")
+        print(f"Metric Error Handling:     {metric_results['passed']}/{metric_results['total']} passed")
+        print(f"Edge Case Handling:        {edge_results['passed']}/{edge_results['total']} passed")
+        print(f"File Handling Errors:      {file_results['passed']}/{file_results['total']} passed")
         
         print("=" * 70)
-        print(f"🎯 OVERALL RESULTS: {total_passed}/{total_tests} tests passed ({total_passed/total_tests*100:.1f}%)")
+        print(f"🎯 OVERALL RESULTS: {total_passed}/{total_tests} tests passed ({pass_rate*100:.1f}%)")
         
         success_threshold = 0.8  # 80% of tests should pass
-        test_suite_passed = (total_passed / total_tests) >= success_threshold
+        test_suite_passed = pass_rate >= success_threshold
         
         if test_suite_passed:
             print("🎉 TASK 5.5 COMPLETED SUCCESSFULLY!")
@@ -448,6 +566,56 @@ class InvalidURLTestSuite:
         return test_suite_passed
 
 
+# pytest entry points; the suite class above remains the script runner
+
+@pytest.fixture(scope='module', autouse=True)
+def _cached_http():
+    with _http_cache():
+        yield
+
+
+@pytest.fixture(scope='module')
+def suite() -> InvalidURLTestSuite:
+    return InvalidURLTestSuite()
+
+
+@pytest.fixture(scope='module')
+def metrics() -> Dict[str, Any]:
+    return dict(_get_metrics())
+
+
+@pytest.mark.parametrize("case", CLI_INVALID_URL_CASES, ids=lambda c: c["name"])
+def test_cli_handles_invalid_urls(suite, case, request):
+    """The CLI fails on invalid URLs with exit code 1; empty ones may be skipped."""
+    exit_code, stdout, stderr = suite.run_cli_with_urls(case["urls"])
+    request.node.add_report_section("call", "cli", f"exit code {exit_code}\nSTDOUT: {stdout[:200]}\nSTDERR: {stderr[:200]}")
+    expected = (0, 1) if case["name"] in CLI_MAY_EXIT_ZERO else (1,)
+    assert exit_code in expected, case["expected_behavior"]
+
+
+@pytest.mark.parametrize("metric_name", [name for name, _ in METRIC_CLASSES])
+@pytest.mark.parametrize("url,description", INVALID_METRIC_URLS, ids=[d for _, d in INVALID_METRIC_URLS])
+def test_metric_rejects_invalid_url(metrics, metric_name, url, description, request):
+    """Each metric rejects an invalid URL or raises one of the project's errors."""
+    metric = metrics[metric_name]
+    try:
+        if not metric.supports(url, "MODEL"):
+            return
+        metric.compute(url, "MODEL")
+    except (ValidationError, APIError, MetricError) as e:
+        request.node.add_report_section("call", "metric", f"{type(e).__name__}: {e}")
+        return
+    pytest.fail(f"{metric_name} accepted {description}: {url!r}")
+
+
+@pytest.mark.parametrize("case", EDGE_CASES, ids=lambda c: c["name"])
+def test_cli_handles_edge_cases(suite, case, request):
+    """Unusual but well-formed URLs never crash the CLI."""
+    exit_code, _, stderr = suite.run_cli_with_urls(case["urls"])
+    request.node.add_report_section("call", "cli", f"exit code {exit_code}\nSTDERR: {stderr[:200]}")
+    assert exit_code in (0, 1), case["description"]
+
+
 def run_quick_invalid_url_test():
     """Run a quick test of invalid URL handling."""
     
@@ -456,7 +624,7 @@ def run_quick_invalid_url_test():
     
     # Test a few metrics with invalid URLs
     try:
-        metric = HFAPIMetric()
+        metric = dict(_get_metrics())["HuggingFace API"]
         
         # Test invalid URLs
         invalid_urls = [
@@ -469,10 +637,10 @@ def run_quick_invalid_url_test():
         
         for url in invalid_urls:
             try:
-                if not metric.supports(url, Category.MODEL):
+                if not metric.supports(url, "MODEL"):
                     print(f"✅ Rejected: {url}")
                 else:
-                    result = metric.compute(url, Category.MODEL)
+                    result = metric.compute(url, "MODEL")
                     print(f"⚠️  Unexpectedly processed: {url}")
             except (ValidationError, APIError, MetricError) as e:
                 print(f"✅ Caught {type(e).__name__}: {url}")
@@ -489,11 +657,12 @@ def run_quick_invalid_url_test():
 
 if __name__ == "__main__":
     # Run based on command line arguments
-    if len(sys.argv) > 1 and sys.argv[1] == "--quick":
-        success = run_quick_invalid_url_test()
-    else:
-        # Run comprehensive test suite
-        test_suite = InvalidURLTestSuite()
-        success = test_suite.run_comprehensive_test()
+    with _http_cache():
+        if len(sys.argv) > 1 and sys.argv[1] == "--quick":
+            success = run_quick_invalid_url_test()
+        else:
+            # Run comprehensive test suite
+            test_suite = InvalidURLTestSuite()
+            success = test_suite.run_comprehensive_test()
     
     sys.exit(0 if success else 1)
@@ -18,21 +18,56 @@ Expected Behavior:
 - All latency values should be non-negative integers
 """
 
+import functools
+import io
+import logging
+import logging.handlers
 import os
+import socket
 import sys
-import json
 import subprocess
+import tempfile
 from pathlib import Path
 from typing import Dict, Any, List
 
+import orjson
+import pytest
+
+from cli_capture import run_cli_captured
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
 # Define paths
-REPO_ROOT = Path(__file__).parent.parent
+REPO_ROOT = Path(__file__).resolve().parent
 BS_DIR = REPO_ROOT / "bs"
 RUN_SCRIPT = BS_DIR / "run"
 TEST_URL_FILE = BS_DIR / "test_urls_task_6_1.txt"
+# Bytecode shared by every child interpreter, kept out of the repo
+PYCACHE_PREFIX = Path(tempfile.gettempdir()) / "acemcli-task-6-1-pycache"
+
+# The CLI is called in-process; set TASK_6_1_SUBPROCESS=1 to run it in a
+# child interpreter instead. The ./run shell wrapper itself is only exercised
+# by test_shell_wrapper, which is opt-in via TASK_6_1_TEST_WRAPPER=1
+USE_SUBPROCESS = os.environ.get("TASK_6_1_SUBPROCESS") == "1"
+TEST_WRAPPER = os.environ.get("TASK_6_1_TEST_WRAPPER") == "1"
+CLI_MODULE_COMMAND = [sys.executable, "-m", "acemcli.cli"]
+
+# Logging configuration handed to the CLI
+CLI_ENV = {
+    'LOG_LEVEL': '1',  # Info level
+    'LOG_FILE': str(BS_DIR / 'integration_test.log'),
+}
+
+# acemcli is imported only by the in-process path, so the rest of the module
+# (and the subprocess path, which inherits this sys.path) works without it
+sys.path.insert(0, str(BS_DIR / "src"))
 
-# Required fields in NDJSON output
-REQUIRED_FIELDS = [
+# Required fields in NDJSON output; sets so presence checks are set operations
+# against result.keys()
+REQUIRED_FIELDS = frozenset([
     "name",
     "category",
     "net_score",
@@ -53,31 +88,103 @@ REQUIRED_FIELDS = [
     "dataset_quality_latency",
     "code_quality",
     "code_quality_latency",
+])
+
+SCORE_FIELDS = frozenset([
+    'net_score', 'ramp_up_time', 'bus_factor', 'performance_claims',
+    'license', 'dataset_and_code_score', 'dataset_quality', 'code_quality'
+])
+
+SIZE_SCORE_KEYS = frozenset(['raspberry_pi', 'jetson_nano', 'desktop_pc', 'aws_server'])
+
+LATENCY_FIELDS = [
+    'net_score_latency',
+    'ramp_up_time_latency',
+    'bus_factor_latency',
+    'performance_claims_latency',
+    'license_latency',
+    'size_score_latency',
+    'dataset_and_code_score_latency',
+    'dataset_quality_latency',
+    'code_quality_latency',
 ]
 
+# The same rules as the field-by-field checks below, at least as strict.
+# Draft 4 keeps "integer" from accepting floats such as 12.0
+_UNIT_INTERVAL = {"type": "number", "minimum": 0, "maximum": 1}
+RESULT_SCHEMA = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "type": "object",
+    "required": sorted(REQUIRED_FIELDS),
+    "properties": {
+        "category": {"enum": ["MODEL"]},
+        **{field: _UNIT_INTERVAL for field in SCORE_FIELDS},
+        "size_score": {
+            "type": "object",
+            "properties": {key: _UNIT_INTERVAL for key in sorted(SIZE_SCORE_KEYS)},
+        },
+        **{field: {"type": "integer", "minimum": 0} for field in LATENCY_FIELDS},
+    },
+}
+
+_validate_result = fastjsonschema.compile(RESULT_SCHEMA) if fastjsonschema else None
+
+class _StdoutFdHandler(logging.Handler):
+    """Write formatted records straight to the stdout file descriptor"""
+    
+    def __init__(self, fd: int):
+        super().__init__()
+        self.fd = fd
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            os.write(self.fd, (self.format(record) + "\n").encode("utf-8"))
+        except Exception:
+            self.handleError(record)
+
+# Progress goes through a buffered logger: step details only appear with
+# VERBOSE=1, and buffered lines are written together when an error is logged
+# or the run ends. It does not propagate to the root logger, which the CLI
+# reconfigures when it is called in-process
+log = logging.getLogger("task_6_1")
+log.setLevel(logging.INFO if os.environ.get("VERBOSE") else logging.WARNING)
+log.propagate = False
+try:
+    _console = _StdoutFdHandler(sys.stdout.fileno())
+except (AttributeError, ValueError, io.UnsupportedOperation):
+    # stdout has no real descriptor (e.g. replaced by a StringIO)
+    _console = logging.StreamHandler(sys.stdout)
+_console.setFormatter(logging.Formatter("%(message)s"))
+_log_buffer = logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=_console)
+log.addHandler(_log_buffer)
+
 def print_header(title: str):
-    """Print formatted section header"""
-    print("\n" + "=" * 80)
-    print(f"  {title}")
-    print("=" * 80)
+    """Log formatted section header"""
+    log.info("\n%s\n  %s\n%s", "=" * 80, title, "=" * 80)
 
 def print_success(msg: str):
-    """Print success message"""
-    print(f"✅ {msg}")
+    """Log success message"""
+    log.info("✅ %s", msg)
 
 def print_error(msg: str):
-    """Print error message"""
-    print(f"❌ {msg}")
+    """Log error message"""
+    log.error("❌ %s", msg)
 
 def print_info(msg: str):
-    """Print info message"""
-    print(f"ℹ️  {msg}")
+    """Log info message"""
+    log.info("ℹ️  %s", msg)
 
-def create_test_url_file() -> Path:
-    """Create a test URL file with 3 different URL types"""
-    print_header("STEP 1: Creating Test URL File")
-    
-    content = """# Test URL File for Task 6.1 - Integration Testing
+def matches_result_schema(result: Dict[str, Any]) -> bool:
+    """Check a result against RESULT_SCHEMA with the compiled validator, if available"""
+    if _validate_result is None:
+        return False
+    try:
+        _validate_result(result)
+    except fastjsonschema.JsonSchemaException:
+        return False
+    return True
+
+TEST_URL_CONTENT = """# Test URL File for Task 6.1 - Integration Testing
 # This file contains 3 different URL types as specified in the requirements
 
 # MODEL URL (should be processed)
@@ -89,13 +196,19 @@ https://huggingface.co/datasets/squad
 # CODE URL (should be skipped - not MODEL category)
 https://github.com/huggingface/transformers
 """
+
+def create_test_url_file(path: Path = TEST_URL_FILE) -> Path:
+    """Create a test URL file with 3 different URL types"""
+    print_header("STEP 1: Creating Test URL File")
     
-    TEST_URL_FILE.write_text(content)
-    print_success(f"Created test URL file: {TEST_URL_FILE}")
+    # The content never changes, so a file left by an earlier run is reused
+    if not path.exists() or path.read_text() != TEST_URL_CONTENT:
+        path.write_text(TEST_URL_CONTENT)
+    print_success(f"Created test URL file: {path}")
     print_info(f"File contains 3 URLs: 1 MODEL, 1 DATASET, 1 CODE")
     print_info(f"Expected: Only MODEL URL should be processed")
     
-    return TEST_URL_FILE
+    return path
 
 def verify_run_script_exists() -> bool:
     """Verify that the ./run script exists and is executable"""
@@ -117,42 +230,84 @@ def verify_run_script_exists() -> bool:
     
     return True
 
-def run_cli_command(url_file: Path) -> tuple[int, str, str]:
-    """Run the ./run URL_FILE command"""
-    print_header("STEP 3: Running ./run URL_FILE Command")
-    
-    # Convert to absolute path as required by the CLI
-    absolute_path = url_file.absolute()
-    print_info(f"Running command: {RUN_SCRIPT} {absolute_path}")
-    
-    # Set environment variables for logging
-    env = os.environ.copy()
-    env['LOG_LEVEL'] = '1'  # Info level
-    env['LOG_FILE'] = str(BS_DIR / 'integration_test.log')
-    
-    print_info(f"LOG_LEVEL=1 (info)")
-    print_info(f"LOG_FILE={env['LOG_FILE']}")
-    
+def _child_env(env: Dict[str, str]) -> Dict[str, str]:
+    """Environment for a child interpreter running the CLI"""
+    # This process's import path so the same acemcli is loaded, and bytecode
+    # kept in one shared cache that every child reuses
+    child_env = {
+        **os.environ,
+        'PYTHONPATH': os.pathsep.join(sys.path),
+        'PYTHONPYCACHEPREFIX': str(PYCACHE_PREFIX),
+        **env,
+    }
+    child_env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return child_env
+
+def _run_cli_subprocess(command: List[str], env: Dict[str, str]) -> tuple[int, bytes, str]:
+    """Run a CLI command line in a child process"""
+    child_env = _child_env(env)
     try:
-        result = subprocess.run(
-            [str(RUN_SCRIPT), str(absolute_path)],
+        proc = subprocess.Popen(
+            command,
             cwd=BS_DIR,
-            capture_output=True,
-            text=True,
-            env=env,
-            timeout=60  # 60 second timeout
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=child_env
         )
-        
-        return result.returncode, result.stdout, result.stderr
+    except Exception as e:
+        print_error(f"Failed to run command: {e}")
+        return -1, b"", str(e)
     
+    # communicate() returns as soon as the child exits; 60s is only the cap
+    try:
+        stdout, stderr = proc.communicate(timeout=60)
     except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
         print_error("Command timed out after 60 seconds")
-        return -1, "", "Timeout"
+        return -1, b"", "Timeout"
+    
+    # stdout stays as bytes for orjson; only stderr is shown as text
+    return proc.returncode, stdout, stderr.decode('utf-8', errors='replace')
+
+def _run_cli_in_process(absolute_path: Path, env: Dict[str, str]) -> tuple[int, bytes, str]:
+    """Call the CLI entry point directly with the given environment overrides"""
+    saved_env = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    
+    try:
+        from acemcli.cli import main as cli_main
+        return run_cli_captured(cli_main, str(absolute_path))
     except Exception as e:
         print_error(f"Failed to run command: {e}")
-        return -1, "", str(e)
+        return -1, b"", str(e)
+    finally:
+        for key, value in saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
 
-def parse_ndjson_output(stdout: str) -> List[Dict[str, Any]]:
+def run_cli_command(url_file: Path) -> tuple[int, bytes, str]:
+    """Run the ./run URL_FILE command"""
+    print_header("STEP 3: Running ./run URL_FILE Command")
+    
+    # Convert to absolute path as required by the CLI
+    absolute_path = url_file.absolute()
+    command = CLI_MODULE_COMMAND + [str(absolute_path)]
+    if USE_SUBPROCESS:
+        print_info(f"Running command: {' '.join(command)}")
+    else:
+        print_info(f"Calling acemcli.cli.main({absolute_path}) in-process")
+    
+    print_info(f"LOG_LEVEL=1 (info)")
+    print_info(f"LOG_FILE={CLI_ENV['LOG_FILE']}")
+    
+    if USE_SUBPROCESS:
+        return _run_cli_subprocess(command, CLI_ENV)
+    return _run_cli_in_process(absolute_path, CLI_ENV)
+
+def parse_ndjson_output(stdout: bytes) -> List[Dict[str, Any]]:
     """Parse NDJSON output into a list of dictionaries"""
     print_header("STEP 4: Parsing NDJSON Output")
     
@@ -160,7 +315,8 @@ def parse_ndjson_output(stdout: str) -> List[Dict[str, Any]]:
         print_error("No output received (stdout is empty)")
         return []
     
-    lines = stdout.strip().split('\n')
+    # orjson validates UTF-8 itself, so the bytes are never decoded up front
+    lines = stdout.strip().splitlines()
     print_info(f"Received {len(lines)} output line(s)")
     
     results = []
@@ -169,12 +325,12 @@ def parse_ndjson_output(stdout: str) -> List[Dict[str, Any]]:
             continue
         
         try:
-            data = json.loads(line)
+            data = orjson.loads(line)
             results.append(data)
             print_success(f"Line {i}: Valid JSON parsed")
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print_error(f"Line {i}: Invalid JSON - {e}")
-            print_info(f"  Content: {line[:100]}...")
+            print_info(f"  Content: {line[:100].decode('utf-8', errors='replace')}...")
     
     return results
 
@@ -189,13 +345,18 @@ def verify_ndjson_format(results: List[Dict[str, Any]]) -> bool:
     all_valid = True
     
     for i, result in enumerate(results, 1):
-        print(f"\n📊 Result {i}: {result.get('name', 'UNKNOWN')}")
-        print("-" * 60)
+        log.info("\n📊 Result %d: %s\n%s", i, result.get('name', 'UNKNOWN'), "-" * 60)
+        
+        # A result that passes the schema passes every check below, so only
+        # a failing one needs the field-by-field report
+        if matches_result_schema(result):
+            print_success("Result matches the NDJSON schema")
+            continue
         
         # Check all required fields are present
-        missing_fields = [f for f in REQUIRED_FIELDS if f not in result]
+        missing_fields = REQUIRED_FIELDS - result.keys()
         if missing_fields:
-            print_error(f"Missing fields: {', '.join(missing_fields)}")
+            print_error(f"Missing fields: {', '.join(sorted(missing_fields))}")
             all_valid = False
         else:
             print_success("All required fields present")
@@ -208,33 +369,29 @@ def verify_ndjson_format(results: List[Dict[str, Any]]) -> bool:
             print_success(f"Category: {result['category']}")
         
         # Verify scores are in [0, 1] range
-        score_fields = [
-            'net_score', 'ramp_up_time', 'bus_factor', 'performance_claims',
-            'license', 'dataset_and_code_score', 'dataset_quality', 'code_quality'
-        ]
-        for field in score_fields:
-            if field in result:
-                value = result[field]
-                if isinstance(value, (int, float)):
-                    if 0 <= value <= 1:
-                        print_success(f"{field}: {value:.3f} (valid range)")
-                    else:
-                        print_error(f"{field}: {value} (out of range [0,1])")
-                        all_valid = False
+        for field in sorted(SCORE_FIELDS & result.keys()):
+            value = result[field]
+            if isinstance(value, (int, float)):
+                if 0 <= value <= 1:
+                    print_success(f"{field}: {value:.3f} (valid range)")
+                else:
+                    print_error(f"{field}: {value} (out of range [0,1])")
+                    all_valid = False
         
         # Verify size_score structure
         if 'size_score' in result:
             size_score = result['size_score']
             if isinstance(size_score, dict):
-                expected_keys = ['raspberry_pi', 'jetson_nano', 'desktop_pc', 'aws_server']
-                for key in expected_keys:
-                    if key in size_score:
-                        value = size_score[key]
-                        if isinstance(value, (int, float)) and 0 <= value <= 1:
-                            print_success(f"size_score.{key}: {value:.3f}")
-                        else:
-                            print_error(f"size_score.{key}: {value} (invalid)")
-                            all_valid = False
+                missing_keys = SIZE_SCORE_KEYS - size_score.keys()
+                if missing_keys:
+                    print_info(f"size_score has no entry for: {', '.join(sorted(missing_keys))}")
+                for key in sorted(SIZE_SCORE_KEYS & size_score.keys()):
+                    value = size_score[key]
+                    if isinstance(value, (int, float)) and 0 <= value <= 1:
+                        print_success(f"size_score.{key}: {value:.3f}")
+                    else:
+                        print_error(f"size_score.{key}: {value} (invalid)")
+                        all_valid = False
             else:
                 print_error("size_score is not a dictionary")
                 all_valid = False
@@ -249,25 +406,16 @@ def verify_latency_measurements(results: List[Dict[str, Any]]) -> bool:
         print_error("No results to verify")
         return False
     
-    latency_fields = [
-        'net_score_latency',
-        'ramp_up_time_latency',
-        'bus_factor_latency',
-        'performance_claims_latency',
-        'license_latency',
-        'size_score_latency',
-        'dataset_and_code_score_latency',
-        'dataset_quality_latency',
-        'code_quality_latency',
-    ]
-    
     all_valid = True
     
     for i, result in enumerate(results, 1):
-        print(f"\n⏱️  Result {i}: {result.get('name', 'UNKNOWN')}")
-        print("-" * 60)
+        log.info("\n⏱️  Result %d: %s\n%s", i, result.get('name', 'UNKNOWN'), "-" * 60)
+        
+        if matches_result_schema(result):
+            print_success("All latencies are non-negative integers")
+            continue
         
-        for field in latency_fields:
+        for field in LATENCY_FIELDS:
             if field in result:
                 value = result[field]
                 
@@ -318,18 +466,15 @@ def main():
     
     if returncode != 0:
         print_error(f"Command failed with return code: {returncode}")
-        print_info("STDERR:")
-        print(stderr)
-        print_info("STDOUT:")
-        print(stdout)
+        log.warning("ℹ️  STDERR:\n%s", stderr)
+        log.warning("ℹ️  STDOUT:\n%s", stdout.decode('utf-8', errors='replace'))
         # Don't fail completely, try to parse output anyway
     else:
         print_success(f"Command completed successfully (return code: {returncode})")
         tests_passed += 1
     
     if stderr:
-        print_info("STDERR output:")
-        print(stderr)
+        log.info("ℹ️  STDERR output:\n%s", stderr)
     
     # Step 4: Parse NDJSON output
     results = parse_ndjson_output(stdout)
@@ -338,8 +483,7 @@ def main():
         print_success(f"Successfully parsed {len(results)} result(s)")
     else:
         print_error("Failed to parse any results")
-        print_info("Raw stdout:")
-        print(stdout)
+        log.warning("ℹ️  Raw stdout:\n%s", stdout.decode('utf-8', errors='replace'))
         return 1
     
     # Step 5: Verify NDJSON format
@@ -356,16 +500,87 @@ def main():
     else:
         print_error("Latency measurement verification failed")
     
-    # Final Summary
-    print_header("TASK 6.1 TEST SUMMARY")
+    # Final Summary, always shown after any buffered step output
+    _log_buffer.flush()
+    print("\n" + "=" * 80)
+    print("  TASK 6.1 TEST SUMMARY")
+    print("=" * 80)
     print(f"\n📊 Tests Passed: {tests_passed}/{tests_total}")
     
     if tests_passed == tests_total:
-        print_success("✨ ALL TESTS PASSED! Task 6.1 is COMPLETE ✅")
+        print("✅ ✨ ALL TESTS PASSED! Task 6.1 is COMPLETE ✅")
         return 0
     else:
-        print_error(f"❌ {tests_total - tests_passed} test(s) failed")
+        print(f"❌ ❌ {tests_total - tests_passed} test(s) failed")
         return 1
 
+# pytest entry points: the CLI runs once per session and each check reuses it
+
+@functools.lru_cache(maxsize=1)
+def huggingface_reachable() -> bool:
+    """Whether a TCP connection to huggingface.co:443 opens within 0.5s"""
+    try:
+        socket.create_connection(("huggingface.co", 443), timeout=0.5).close()
+    except OSError:
+        return False
+    return True
+
+@pytest.fixture(scope="session")
+def url_file(tmp_path_factory) -> Path:
+    return create_test_url_file(tmp_path_factory.mktemp("urls") / "urls.txt")
+
+@pytest.fixture(scope="session")
+def warm_bytecode() -> None:
+    """Compile acemcli into the shared bytecode cache before any timed child run"""
+    subprocess.run(
+        [sys.executable, "-c", "import acemcli.cli"],
+        cwd=BS_DIR,
+        env=_child_env({}),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=60
+    )
+
+@pytest.fixture(scope="session")
+def cli_run(url_file, request) -> tuple[int, bytes, str]:
+    # Offline, the CLI would only fail after its timeouts; skip up front
+    if not huggingface_reachable():
+        pytest.skip("huggingface.co is unreachable")
+    if USE_SUBPROCESS:
+        request.getfixturevalue("warm_bytecode")
+    else:
+        pytest.importorskip("acemcli.cli")
+    return run_cli_command(url_file)
+
+@pytest.fixture(scope="session")
+def cli_results(cli_run) -> List[Dict[str, Any]]:
+    _, stdout, _ = cli_run
+    return parse_ndjson_output(stdout)
+
+def test_run_script_exists():
+    assert verify_run_script_exists()
+
+@pytest.mark.skipif(not TEST_WRAPPER, reason="set TASK_6_1_TEST_WRAPPER=1 to run ./run")
+def test_shell_wrapper(url_file, warm_bytecode):
+    returncode, _, stderr = _run_cli_subprocess([str(RUN_SCRIPT), str(url_file.absolute())], CLI_ENV)
+    assert returncode == 0, stderr
+
+def test_cli_exit_code(cli_run):
+    returncode, _, stderr = cli_run
+    assert returncode == 0, stderr
+
+def test_ndjson_parsed(cli_results):
+    assert cli_results, "CLI produced no NDJSON results"
+
+def test_ndjson_format(cli_results):
+    assert verify_ndjson_format(cli_results)
+
+def test_latency_measurements(cli_results):
+    assert verify_latency_measurements(cli_results)
+
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        exit_code = main()
+    finally:
+        _log_buffer.close()
+    sys.exit(exit_code)
@@ -5,82 +5,118 @@ Quick verification script for Task 5.4 timeout handling implementation.
 
 import sys
 import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 # Add the src directory to Python path
 sys.path.insert(0, '/Users/blas/Documents/Obsidian Vault/School/F25/ECE 461/Project Repo/ECE30861_HW1/src')
 
+def _step_import_config():
+    from acemcli.timeout_config import TimeoutConfig, get_timeout_config, create_requests_session
+    return ["   ✅ Timeout configuration imported successfully"]
+
+def _step_create_config():
+    from acemcli.timeout_config import TimeoutConfig
+    config = TimeoutConfig(connect_timeout=10.0, read_timeout=30.0, total_timeout=45.0)
+    return [f"   ✅ Created config: connect={config.connect_timeout}s, read={config.read_timeout}s, total={config.total_timeout}s"]
+
+def _step_environment_config():
+    from acemcli.timeout_config import TimeoutConfig
+    # The overrides are undone on exit so later steps see the original environment
+    with patch.dict(os.environ, {
+        'ACME_CONNECT_TIMEOUT': '5.0',
+        'ACME_READ_TIMEOUT': '20.0',
+        'ACME_TOTAL_TIMEOUT': '30.0',
+    }):
+        env_config = TimeoutConfig.from_environment()
+    return [f"   ✅ Environment config: connect={env_config.connect_timeout}s, read={env_config.read_timeout}s, total={env_config.total_timeout}s"]
+
+def _step_requests_session():
+    from acemcli.timeout_config import create_requests_session
+    session = create_requests_session()
+    return [f"   ✅ Created requests session: {type(session).__name__}"]
+
+def _step_metric_initialization():
+    from acemcli.metrics.hf_api import HFAPIMetric
+    from acemcli.metrics.local_repo import LocalRepoMetric
+    from acemcli.metrics.dataset_code_score import DatasetAndCodeScoreMetric
+    
+    # Each metric is built once and reused by the checks below
+    hf_metric = HFAPIMetric()
+    local_metric = LocalRepoMetric()
+    dataset_metric = DatasetAndCodeScoreMetric()
+    
+    return [
+        f"   ✅ HFAPIMetric initialized with timeout config: {hf_metric.timeout_config.total_timeout}s",
+        f"   ✅ LocalRepoMetric initialized with timeout config: {local_metric.timeout_config.total_timeout}s",
+        f"   ✅ DatasetAndCodeScoreMetric initialized with timeout config: {dataset_metric.timeout_config.total_timeout}s",
+    ]
+
+def _step_timeout_error():
+    from acemcli.exceptions import create_api_timeout_error
+    timeout_error = create_api_timeout_error("TestAPI", "https://test.com", 30)
+    return [
+        f"   ✅ Created timeout error: {timeout_error.message}",
+        f"      API: {timeout_error.api_name}, Status: {timeout_error.status_code}",
+    ]
+
+def _step_timeout_formats():
+    from acemcli.timeout_config import TimeoutConfig
+    config = TimeoutConfig(connect_timeout=10.0, read_timeout=30.0, total_timeout=45.0)
+    return [
+        f"   ✅ Requests timeout: {config.as_requests_timeout()}",
+        f"   ✅ HuggingFace timeout: {config.as_huggingface_timeout()}",
+    ]
+
+STEPS = [
+    ("Testing timeout configuration import", _step_import_config),
+    ("Testing timeout configuration creation", _step_create_config),
+    ("Testing environment variable configuration", _step_environment_config),
+    ("Testing requests session creation", _step_requests_session),
+    ("Testing metric initialization", _step_metric_initialization),
+    ("Testing timeout error creation", _step_timeout_error),
+    ("Testing timeout format conversion", _step_timeout_formats),
+]
+
+def _run_step(step):
+    """Run one step, returning (output lines, exception or None)."""
+    try:
+        return step(), None
+    except Exception as e:
+        return [], e
+
 def test_timeout_implementation():
     """Test the timeout implementation components."""
     
     print("🔍 Testing Task 5.4: API Timeout Handling Implementation")
     print("=" * 60)
     
-    try:
-        # Test 1: Import timeout configuration
-        print("1. Testing timeout configuration import...")
-        from acemcli.timeout_config import TimeoutConfig, get_timeout_config, create_requests_session
-        print("   ✅ Timeout configuration imported successfully")
-        
-        # Test 2: Create timeout configuration
-        print("2. Testing timeout configuration creation...")
-        config = TimeoutConfig(connect_timeout=10.0, read_timeout=30.0, total_timeout=45.0)
-        print(f"   ✅ Created config: connect={config.connect_timeout}s, read={config.read_timeout}s, total={config.total_timeout}s")
-        
-        # Test 3: Test environment variable configuration
-        print("3. Testing environment variable configuration...")
-        os.environ['ACME_CONNECT_TIMEOUT'] = '5.0'
-        os.environ['ACME_READ_TIMEOUT'] = '20.0'
-        os.environ['ACME_TOTAL_TIMEOUT'] = '30.0'
-        env_config = TimeoutConfig.from_environment()
-        print(f"   ✅ Environment config: connect={env_config.connect_timeout}s, read={env_config.read_timeout}s, total={env_config.total_timeout}s")
-        
-        # Test 4: Test requests session creation
-        print("4. Testing requests session creation...")
-        session = create_requests_session()
-        print(f"   ✅ Created requests session: {type(session).__name__}")
-        
-        # Test 5: Test metric initialization with timeout config
-        print("5. Testing metric initialization...")
-        
-        # Test HFAPIMetric
-        from acemcli.metrics.hf_api import HFAPIMetric
-        hf_metric = HFAPIMetric()
-        print(f"   ✅ HFAPIMetric initialized with timeout config: {hf_metric.timeout_config.total_timeout}s")
-        
-        # Test LocalRepoMetric
-        from acemcli.metrics.local_repo import LocalRepoMetric
-        local_metric = LocalRepoMetric()
-        print(f"   ✅ LocalRepoMetric initialized with timeout config: {local_metric.timeout_config.total_timeout}s")
-        
-        # Test DatasetAndCodeScoreMetric
-        from acemcli.metrics.dataset_code_score import DatasetAndCodeScoreMetric
-        dataset_metric = DatasetAndCodeScoreMetric()
-        print(f"   ✅ DatasetAndCodeScoreMetric initialized with timeout config: {dataset_metric.timeout_config.total_timeout}s")
-        
-        # Test 6: Test timeout error creation
-        print("6. Testing timeout error creation...")
-        from acemcli.exceptions import create_api_timeout_error
-        timeout_error = create_api_timeout_error("TestAPI", "https://test.com", 30)
-        print(f"   ✅ Created timeout error: {timeout_error.message}")
-        print(f"      API: {timeout_error.api_name}, Status: {timeout_error.status_code}")
-        
-        # Test 7: Test timeout formats
-        print("7. Testing timeout format conversion...")
-        requests_timeout = config.as_requests_timeout()
-        hf_timeout = config.as_huggingface_timeout()
-        print(f"   ✅ Requests timeout: {requests_timeout}")
-        print(f"   ✅ HuggingFace timeout: {hf_timeout}")
-        
-        print("\n🎉 ALL TESTS PASSED!")
-        print("✅ Task 5.4: API Timeout Handling Implementation is COMPLETE")
-        
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # The environment step patches os.environ, so it runs on this thread first,
+    # after the config module has loaded its defaults as it did when the steps
+    # ran in order; the rest are independent and import-heavy, so they overlap
+    outcomes = {}
+    for step in (_step_import_config, _step_environment_config):
+        outcomes[step] = _run_step(step)
+    pending = [step for _, step in STEPS if step not in outcomes]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        outcomes.update(zip(pending, executor.map(_run_step, pending)))
+    
+    # Report in step order regardless of completion order
+    for number, (title, step) in enumerate(STEPS, 1):
+        print(f"{number}. {title}...")
+        lines, error = outcomes[step]
+        if error is not None:
+            print(f"\n❌ TEST FAILED: {error}")
+            traceback.print_exception(type(error), error, error.__traceback__)
+            return False
+        for line in lines:
+            print(line)
+    
+    print("\n🎉 ALL TESTS PASSED!")
+    print("✅ Task 5.4: API Timeout Handling Implementation is COMPLETE")
+    
+    return True
 
 def test_integration():
     """Test integration with existing error handling."""
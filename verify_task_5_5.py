@@ -6,22 +6,162 @@ This script runs quick verification tests to ensure invalid URL handling
 is working correctly across the system.
 """
 
+import hashlib
+import io
+import itertools
 import sys
 import os
 import subprocess
 import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
-# Add the src directory to Python path
-sys.path.insert(0, '/Users/blas/Documents/Obsidian Vault/School/F25/ECE 461/Project Repo/ECE30861_HW1/src')
+from cli_capture import run_cli_captured
 
-def test_cli_with_invalid_urls():
+# Section separators and the per-suite results line
+_SEP50 = "=" * 50
+_SEP60 = "=" * 60
+_BANNER = "\n" + _SEP60
+_RESULT_LINE = "{label:<27}{passed}/{total} passed"
+
+# Project root (this script's directory); its src directory goes on the path once
+_PROJECT_ROOT = Path(__file__).resolve().parent
+_SRC = _PROJECT_ROOT / 'src'
+if str(_SRC) not in sys.path:
+    sys.path.insert(0, str(_SRC))
+
+# The CLI is imported once and called in-process; the ./run wrapper is only
+# used when it can't be imported here
+try:
+    from acemcli import cli as _cli
+except ImportError:
+    _cli = None
+
+# Suites running in the pool write their output into a buffer instead of
+# printing, so each suite's output can be written as one block, in order
+_output = threading.local()
+
+def _print(line=""):
+    """Print a line, or buffer it when the calling suite runs in the pool."""
+    buf = getattr(_output, "buf", None)
+    if buf is None:
+        print(line)
+    else:
+        buf.write(line)
+        buf.write("\n")
+
+def _run_suite(suite):
+    """Run one suite on a worker thread, returning its results and output text."""
+    _output.buf = io.StringIO()
+    try:
+        return suite(), _output.buf.getvalue()
+    finally:
+        del _output.buf
+
+# A passing run leaves a marker here named after a digest of the sources it
+# checked, so later runs over unchanged sources can skip straight to the result.
+# Every module under the source roots is hashed: the checks reach the CLI,
+# metrics, models and timeout handling both in-process and through ./run, so
+# any of them can change the outcome
+_CACHE_DIR = _PROJECT_ROOT / '.verify_cache'
+_CACHED_SOURCE_ROOTS = ('src', 'bs/src')
+_CACHED_SOURCES = (
+    'run',
+    'test_malformed_urls.txt',
+    'test_non_huggingface_urls.txt',
+    'test_nonexistent_repos.txt',
+    'test_edge_case_urls.txt',
+    'verify_task_5_5.py',
+)
+
+# Every URL goes through the metrics by default. With TASK_5_5_FAST=1, URLs
+# that fail is_hf_url (the check every metric's supports() starts with) are
+# rejected without calling into them, and the report says so
+FAST = os.environ.get("TASK_5_5_FAST") == "1"
+
+# Metric instances shared by every run, created on first use
+_METRICS = None
+_metrics_lock = threading.Lock()
+
+# Metrics whose supports() results are memoized, keyed by id()
+_metric_registry = {}
+
+@lru_cache(maxsize=256)
+def _supports(metric_id, url, category):
+    """metric.supports(url, category), evaluated once per (metric, url, category)."""
+    return _metric_registry[metric_id].supports(url, category)
+
+def _invoke_cli(test_path):
+    """Call the imported CLI on a URL file, returning its exit code and stderr."""
+    returncode, _, stderr = run_cli_captured(_cli.main, str(test_path))
+    return returncode, stderr
+
+def _run_one(project_root, run_script, test_file):
+    """Run the CLI on one URL file, returning "passed"/"failed" and its report lines."""
+    lines = [f"\n🔍 Testing with {test_file}..."]
+    test_path = project_root / test_file
+    
+    try:
+        # Run the CLI with the invalid URL file
+        if _cli is not None:
+            returncode, stderr = _invoke_cli(test_path)
+        else:
+            # Only the exit code and the start of stderr are reported, so
+            # stdout is discarded and stderr stays bytes until it's sliced
+            result = subprocess.run(
+                [str(run_script), str(test_path)],
+                cwd=str(project_root),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=30
+            )
+            returncode = result.returncode
+            stderr = result.stderr[:200].decode('utf-8', 'replace')
+        
+        # For invalid URLs, we expect the CLI to either:
+        # 1. Exit with code 1 (error)
+        # 2. Exit with code 0 but handle errors gracefully
+        if returncode in [0, 1]:
+            lines.append(f"   ✅ CLI handled invalid URLs appropriately (exit code {returncode})")
+            return "passed", lines
+        lines.append(f"   ❌ CLI failed unexpectedly (exit code {returncode})")
+        if stderr:
+            lines.append(f"      Error: {stderr[:200]}...")
+        return "failed", lines
+            
+    except subprocess.TimeoutExpired:
+        lines.append(f"   ❌ CLI timed out with {test_file}")
+        return "failed", lines
+    except Exception as e:
+        lines.append(f"   ❌ Error testing {test_file}: {e}")
+        return "failed", lines
+
+def _cache_key():
+    """Digest of the checked sources; a missing file hashes differently from any content."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(b'fast' if FAST else b'full')
+    modules = sorted(
+        path.relative_to(_PROJECT_ROOT).as_posix()
+        for root in _CACHED_SOURCE_ROOTS
+        for path in (_PROJECT_ROOT / root).rglob('*.py')
+    )
+    for name in (*modules, *_CACHED_SOURCES):
+        h.update(b'\0' + name.encode())
+        try:
+            h.update(b'\1' + (_PROJECT_ROOT / name).read_bytes())
+        except FileNotFoundError:
+            h.update(b'\2')
+    return h.hexdigest()
+
+def test_cli_with_invalid_urls(project_root=_PROJECT_ROOT):
     """Test the CLI with various invalid URL files."""
     
-    print("🧪 Testing CLI with Invalid URLs")
-    print("=" * 50)
+    _print("🧪 Testing CLI with Invalid URLs")
+    _print(_SEP50)
     
-    project_root = Path('/Users/blas/Documents/Obsidian Vault/School/F25/ECE 461/Project Repo/ECE30861_HW1')
     run_script = project_root / 'run'
     
     # Test files with different types of invalid URLs
@@ -32,109 +172,133 @@ def test_cli_with_invalid_urls():
         'test_edge_case_urls.txt'
     ]
     
-    results = {"passed": 0, "failed": 0}
+    results = Counter(passed=0, failed=0)
     
+    # One directory listing answers every existence check below
+    try:
+        with os.scandir(project_root) as entries:
+            existing = {entry.name for entry in entries if entry.is_file()}
+    except FileNotFoundError:
+        existing = set()
+    
+    present = []
     for test_file in test_files:
-        test_path = project_root / test_file
-        if not test_path.exists():
-            print(f"⚠️  Test file not found: {test_file}")
+        if test_file not in existing:
+            _print(f"⚠️  Test file not found: {test_file}")
             continue
-            
-        print(f"\n🔍 Testing with {test_file}...")
-        
-        try:
-            # Run the CLI with the invalid URL file
-            result = subprocess.run(
-                [str(run_script), str(test_path)],
-                cwd=str(project_root),
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            # For invalid URLs, we expect the CLI to either:
-            # 1. Exit with code 1 (error)
-            # 2. Exit with code 0 but handle errors gracefully
-            if result.returncode in [0, 1]:
-                print(f"   ✅ CLI handled invalid URLs appropriately (exit code {result.returncode})")
-                results["passed"] += 1
-            else:
-                print(f"   ❌ CLI failed unexpectedly (exit code {result.returncode})")
-                if result.stderr:
-                    print(f"      Error: {result.stderr[:200]}...")
-                results["failed"] += 1
-                
-        except subprocess.TimeoutExpired:
-            print(f"   ❌ CLI timed out with {test_file}")
-            results["failed"] += 1
-        except Exception as e:
-            print(f"   ❌ Error testing {test_file}: {e}")
-            results["failed"] += 1
+        present.append(test_file)
+    
+    # Subprocess runs only wait on their child, so they run at once, each with
+    # its own 30s timeout. In-process runs redirect stdout/stderr and replace
+    # the root logger's handlers, so they go one at a time, in order
+    run = partial(_run_one, project_root, run_script)
+    if _cli is None and present:
+        with ThreadPoolExecutor(max_workers=len(present)) as executor:
+            outcomes = list(executor.map(run, present))
+    else:
+        outcomes = [run(f) for f in present]
+    
+    for status, lines in outcomes:
+        for line in lines:
+            _print(line)
+        results[status] += 1
     
     return results
 
+def _get_metrics():
+    """Import the metrics and return the shared (name, instance) pairs."""
+    global _METRICS
+    from acemcli.metrics.hf_api import HFAPIMetric
+    from acemcli.metrics.local_repo import LocalRepoMetric
+    
+    with _metrics_lock:
+        if _METRICS is None:
+            _METRICS = (
+                ("HFAPIMetric", HFAPIMetric()),
+                ("LocalRepoMetric", LocalRepoMetric()),
+            )
+            _metric_registry.update((id(metric), metric) for _, metric in _METRICS)
+    return _METRICS
+
 def test_individual_metrics():
     """Test individual metrics with invalid URLs."""
     
-    print("\n🔧 Testing Individual Metrics with Invalid URLs")
-    print("=" * 50)
+    _print("\n🔧 Testing Individual Metrics with Invalid URLs")
+    _print(_SEP50)
     
-    try:
-        from acemcli.exceptions import ValidationError, APIError, MetricError
-        from acemcli.models import Category
-        from acemcli.metrics.hf_api import HFAPIMetric
-        from acemcli.metrics.local_repo import LocalRepoMetric
-        
-        # Test invalid URLs
-        invalid_urls = [
-            (None, "None URL"),
-            ("", "Empty string"),
-            ("not-a-url", "Invalid format"),
-            ("https://github.com/user/repo", "Non-HuggingFace URL"),
-        ]
-        
-        metrics = [
-            ("HFAPIMetric", HFAPIMetric()),
-            ("LocalRepoMetric", LocalRepoMetric()),
-        ]
+    # Test invalid URLs
+    invalid_urls = [
+        (None, "None URL"),
+        ("", "Empty string"),
+        ("not-a-url", "Invalid format"),
+        ("https://github.com/user/repo", "Non-HuggingFace URL"),
+    ]
+    metric_names = ("HFAPIMetric", "LocalRepoMetric")
+    
+    if FAST:
+        try:
+            from src.metrics.base import is_hf_url
+        except ImportError as e:
+            _print(f"❌ Failed to import required modules: {e}")
+            return Counter(passed=0, failed=1)
+    
+    def needs_metric(url):
+        return not FAST or is_hf_url(url)
+    
+    # In fast mode the metrics are only imported if some URL gets past is_hf_url
+    metrics = {}
+    if any(needs_metric(url) for url, _ in invalid_urls):
+        try:
+            from acemcli.exceptions import ValidationError, APIError, MetricError
+            metrics = dict(_get_metrics())
+        except ImportError as e:
+            _print(f"❌ Failed to import required modules: {e}")
+            return Counter(passed=0, failed=1)
+        cat = "MODEL"
+        excs = (ValidationError, APIError, MetricError)
+    
+    passed = failed = pattern_only = 0
+    current = None
+    
+    for metric_name, (invalid_url, description) in itertools.product(metric_names, invalid_urls):
+        if metric_name != current:
+            current = metric_name
+            _print(f"\n🔍 Testing {metric_name}:")
         
-        results = {"passed": 0, "failed": 0}
+        if not needs_metric(invalid_url):
+            _print(f"   ✅ {description}: Properly rejected by is_hf_url (metric not called)")
+            passed += 1
+            pattern_only += 1
+            continue
         
-        for metric_name, metric in metrics:
-            print(f"\n🔍 Testing {metric_name}:")
+        metric = metrics[metric_name]
+        try:
+            # First check supports method
+            if not _supports(id(metric), invalid_url, cat):
+                _print(f"   ✅ {description}: Properly rejected by supports()")
+                passed += 1
+                continue
             
-            for invalid_url, description in invalid_urls:
-                try:
-                    # First check supports method
-                    if not metric.supports(invalid_url, Category.MODEL):
-                        print(f"   ✅ {description}: Properly rejected by supports()")
-                        results["passed"] += 1
-                        continue
-                    
-                    # If supports() passes, test compute method
-                    result = metric.compute(invalid_url, Category.MODEL)
-                    print(f"   ⚠️  {description}: Unexpectedly succeeded")
-                    results["failed"] += 1
-                    
-                except (ValidationError, APIError, MetricError) as e:
-                    print(f"   ✅ {description}: Properly raised {type(e).__name__}")
-                    results["passed"] += 1
-                    
-                except Exception as e:
-                    print(f"   ⚠️  {description}: Raised unexpected {type(e).__name__}")
-                    results["failed"] += 1
-        
-        return results
-        
-    except ImportError as e:
-        print(f"❌ Failed to import required modules: {e}")
-        return {"passed": 0, "failed": 1}
+            # If supports() passes, test compute method
+            result = metric.compute(invalid_url, cat)
+            _print(f"   ⚠️  {description}: Unexpectedly succeeded")
+            failed += 1
+            
+        except excs as e:
+            _print(f"   ✅ {description}: Properly raised {type(e).__name__}")
+            passed += 1
+            
+        except Exception as e:
+            _print(f"   ⚠️  {description}: Raised unexpected {type(e).__name__}")
+            failed += 1
+    
+    return Counter(passed=passed, failed=failed, pattern_only=pattern_only)
 
 def test_exception_framework():
     """Test that the exception framework is working properly."""
     
-    print("\n🚨 Testing Exception Framework")
-    print("=" * 50)
+    _print("\n🚨 Testing Exception Framework")
+    _print(_SEP50)
     
     try:
         from acemcli.exceptions import (
@@ -142,58 +306,81 @@ def test_exception_framework():
             create_api_timeout_error, create_invalid_url_error,
             create_metric_score_error
         )
-        
-        # Test exception creation
-        validation_error = ValidationError("Test validation error", field_name="test_field")
-        api_error = APIError("Test API error", api_name="TestAPI", status_code=404)
-        metric_error = MetricError("Test metric error", metric_name="test_metric")
-        
-        # Test convenience functions
-        timeout_error = create_api_timeout_error("TestAPI", "https://test.com", 30)
-        url_error = create_invalid_url_error("invalid-url", "Test reason")
-        score_error = create_metric_score_error("test_metric", 1.5)
-        
-        print("   ✅ ValidationError creation works")
-        print("   ✅ APIError creation works")
-        print("   ✅ MetricError creation works")
-        print("   ✅ Timeout error creation works")
-        print("   ✅ URL error creation works")
-        print("   ✅ Score error creation works")
-        
-        return {"passed": 6, "failed": 0}
-        
-    except Exception as e:
-        print(f"   ❌ Exception framework test failed: {e}")
-        return {"passed": 0, "failed": 1}
+    except ImportError as e:
+        _print(f"   ❌ Exception framework test failed: {e}")
+        return Counter(passed=0, failed=1)
+    
+    # Exception classes and convenience functions, each checked on its own
+    cases = (
+        ("ValidationError", ValidationError, ("Test validation error",), {"field_name": "test_field"}),
+        ("APIError", APIError, ("Test API error",), {"api_name": "TestAPI", "status_code": 404}),
+        ("MetricError", MetricError, ("Test metric error",), {"metric_name": "test_metric"}),
+        ("Timeout error", create_api_timeout_error, ("TestAPI", "https://test.com", 30), {}),
+        ("URL error", create_invalid_url_error, ("invalid-url", "Test reason"), {}),
+        ("Score error", create_metric_score_error, ("test_metric", 1.5), {}),
+    )
+    
+    passed = failed = 0
+    for label, factory, args, kwargs in cases:
+        try:
+            factory(*args, **kwargs)
+        except Exception as e:
+            _print(f"   ❌ {label}: {e}")
+            failed += 1
+        else:
+            _print(f"   ✅ {label} creation works")
+            passed += 1
+    
+    return Counter(passed=passed, failed=failed)
 
 def run_verification():
     """Run the complete verification for Task 5.5."""
     
     print("🚀 Task 5.5 Verification: Invalid URL Error Scenarios")
-    print("=" * 60)
+    print(_SEP60)
     print("Testing that invalid URLs are handled gracefully with proper error messages")
-    print("=" * 60)
+    print(_SEP60)
+    
+    cache_marker = _CACHE_DIR / _cache_key()
+    if cache_marker.exists():
+        print("\n✅ Sources unchanged since the last passing run (cached PASS)")
+        return True
     
-    # Run all verification tests
-    cli_results = test_cli_with_invalid_urls()
-    metric_results = test_individual_metrics()
-    exception_results = test_exception_framework()
+    # The suites are independent, so they run together; each one's output is
+    # printed as a block afterwards, in the usual order. An in-process CLI
+    # suite swaps process-wide stdout/stderr and logging, so it runs first, on
+    # its own, before the others start
+    suites = [test_cli_with_invalid_urls, test_individual_metrics, test_exception_framework]
+    outcomes = [_run_suite(suites[0])] if _cli is not None else []
+    with ThreadPoolExecutor(max_workers=len(suites)) as executor:
+        outcomes += executor.map(_run_suite, suites[len(outcomes):])
+    for _, text in outcomes:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    cli_results, metric_results, exception_results = (results for results, _ in outcomes)
     
     # Calculate totals
-    total_passed = cli_results["passed"] + metric_results["passed"] + exception_results["passed"]
-    total_failed = cli_results["failed"] + metric_results["failed"] + exception_results["failed"]
+    totals = cli_results + metric_results + exception_results
+    total_passed = totals["passed"]
+    total_failed = totals["failed"]
     total_tests = total_passed + total_failed
+    pass_rate = total_passed / total_tests * 100 if total_tests else 0.0
     
-    print("\n" + "=" * 60)
+    print(_BANNER)
     print("📊 VERIFICATION RESULTS")
-    print("=" * 60)
+    print(_SEP60)
     
-    print(f"CLI Invalid URL Tests:     {cli_results['passed']}/{cli_results['passed'] + cli_results['failed']} passed")
-    print(f"Metric Error Handling:     {metric_results['passed']}/{metric_results['passed'] + metric_results['failed']} passed")
-    print(f"Exception Framework:       {exception_results['passed']}/{exception_results['passed'] + exception_results['failed']} passed")
+    for label, results in (
+        ("CLI Invalid URL Tests:", cli_results),
+        ("Metric Error Handling:", metric_results),
+        ("Exception Framework:", exception_results),
+    ):
+        print(_RESULT_LINE.format(label=label, passed=results["passed"], total=results["passed"] + results["failed"]))
+    if metric_results["pattern_only"]:
+        print(f"   ({metric_results['pattern_only']} metric checks only ran is_hf_url because TASK_5_5_FAST=1)")
     
-    print("=" * 60)
-    print(f"🎯 OVERALL: {total_passed}/{total_tests} tests passed ({total_passed/total_tests*100:.1f}%)")
+    print(_SEP60)
+    print(f"🎯 OVERALL: {total_passed}/{total_tests} tests passed ({pass_rate:.1f}%)")
     
     if total_passed == total_tests:
         print("\n🎉 TASK 5.5 VERIFICATION SUCCESSFUL!")
@@ -210,6 +397,8 @@ def run_verification():
         print("   • Proper error messages and exit codes")
         print("   • Custom exception hierarchy")
         
+        _CACHE_DIR.mkdir(exist_ok=True)
+        cache_marker.touch()
         return True
     else:
         print("\n⚠️  TASK 5.5 VERIFICATION FAILED")